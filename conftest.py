@@ -0,0 +1 @@
+"""Configuration pytest : la racine du dépôt (tree_complexity.py) est importable depuis tests/."""
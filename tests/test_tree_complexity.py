@@ -0,0 +1,324 @@
+"""
+Tests de non-régression de tree_complexity :
+- aller-retour binaire (serialiser/deserialiser, sauvegarder/charger) ;
+- sous_arbre_complet_max comparé à l'oracle sous_arbre_complet_max_naif ;
+- cohérence des agrégats en cache après insertions et suppressions.
+Chaque test tourne avec NumPy (s'il est installé) et avec le repli 'array'.
+"""
+import random
+
+import pytest
+
+import tree_complexity as tc
+
+MOTEURS = ["numpy", "array"]
+
+@pytest.fixture(params=MOTEURS)
+def moteur(request, monkeypatch):
+    """Sélectionne le moteur des colonnes : NumPy ou le repli sur le module array."""
+    if request.param == "numpy":
+        if tc.np is None: pytest.skip("NumPy non installé")
+    else:
+        monkeypatch.setattr(tc, "np", None)
+    return request.param
+
+ARBRES = {
+    "constArbre1": tc.constArbre1,
+    "constArbre2": tc.constArbre2,
+    "aleatoire_500": lambda: tc.const_arbre_aleatoire(500),
+    "aleatoire_arite_70": lambda: tc.const_arbre_aleatoire(300, 70),
+}
+
+def _verifier_copie(origine, tab):
+    """La copie désérialisée décrit le même arbre que 'origine'."""
+    assert len(tab) == tc.nb_noeuds(origine)
+    assert tc.egalite_structurelle(origine, tab.vers_noeuds())
+    assert [n.info for n in tc.iter_bfs(origine)] == [tab.info(i) for i in range(len(tab))]
+
+# --- Aller-retour binaire ---
+
+@pytest.mark.parametrize("nom", sorted(ARBRES))
+def test_serialiser_deserialiser(moteur, nom):
+    r = ARBRES[nom]()
+    tab = tc.deserialiser_arbre(tc.serialiser_arbre(r))
+    _verifier_copie(r, tab)
+    # Une seconde sérialisation (depuis l'ArbreTableau) donne les mêmes octets
+    assert tc.serialiser_arbre(tab) == tc.serialiser_arbre(r)
+
+@pytest.mark.parametrize("projection", [True, False])
+@pytest.mark.parametrize("nom", sorted(ARBRES))
+def test_sauvegarder_charger(moteur, nom, projection, tmp_path):
+    r = ARBRES[nom]()
+    chemin = tmp_path / "arbre.bin"
+    tc.sauvegarder_arbre(r, str(chemin))
+    assert chemin.read_bytes() == tc.serialiser_arbre(r)
+    tab = tc.charger_arbre(str(chemin), projection=projection)
+    _verifier_copie(r, tab)
+
+def test_format_inconnu():
+    with pytest.raises(ValueError):
+        tc.deserialiser_arbre(b"\0" * 64)
+
+# --- sous_arbre_complet_max contre l'oracle naïf ---
+
+@pytest.mark.parametrize("graine", range(40))
+def test_sous_arbre_complet_max_oracle(graine):
+    rnd = random.Random(graine)
+    forme = rnd.choice(tc.FORMES_GENERATEUR)
+    r = tc.generer_arbre(rnd.randint(1, 200), forme, rnd.choice([1, 2, 3, 4, 70]), graine=graine)
+    # Quelques suppressions pour obtenir des trous dans les tableaux de fils
+    for n in rnd.sample(list(tc.iter_bfs(r)), min(4, tc.nb_noeuds(r))):
+        if n is not r: r = tc.supprimer(r, n.info)
+    assert tc.sous_arbre_complet_max(r) == tc.sous_arbre_complet_max_naif(r)
+
+@pytest.mark.parametrize("construire", [tc.constArbre1, tc.constArbre2])
+def test_sous_arbre_complet_max_arbres_fixes(construire):
+    r = construire()
+    assert tc.sous_arbre_complet_max(r) == tc.sous_arbre_complet_max_naif(r)
+
+# --- Cohérence des agrégats en cache ---
+
+def test_verifier_agregats_apres_modifications():
+    rnd = random.Random(1)
+    r = tc.const_arbre_aleatoire(120)
+    tc.agregats(r) # Remplit les agrégats de tous les noeuds
+    assert all(n.agregat is not None for n in tc.iter_bfs(r))
+    assert tc.verifier_agregats(r) == []
+    for k in range(30):
+        noeuds = list(tc.iter_bfs(r))
+        if k % 3 == 2:
+            r = tc.supprimer(r, rnd.choice(noeuds[1:]).info)
+        else:
+            tc.inserer(rnd.choice(noeuds), f"Ajout{k}")
+        tc.agregats(r) # Recalcule le chemin invalidé
+        assert tc.verifier_agregats(r) == []
+
+def test_verifier_agregats_detecte_un_cache_faux():
+    r = tc.constArbre2()
+    tc.agregats(r)
+    noeud = r.fils[0]
+    (h, parfait, complet, taille), best_n, best_node = noeud.agregat
+    noeud.agregat = ((h + 1, parfait, complet, taille), best_n, best_node)
+    assert tc.verifier_agregats(r) == [noeud]
+
+# --- Recherche sur les colonnes ---
+
+@pytest.mark.parametrize("forme", ["complet", "eventail", "chaine"])
+def test_rechercher_tableau_genere(moteur, forme):
+    tab = tc.generer_arbre(50, forme, sortie="tableau")
+    r = tc.generer_arbre(50, forme)
+    for val in ("Root", "N5", "N49", "N50", "N05", "N", "Absent", 5):
+        i = tab.rechercher(val)
+        attendu = tc.rechercher(r, val)
+        if attendu is None: assert i == -1
+        else: assert tc.suivre_rangs(r, tab.rangs(i)) is attendu
+
+# --- Construction depuis des arêtes ---
+
+def test_construire_depuis_aretes_ordre_quelconque():
+    r = tc.construire_depuis_aretes([("b", "c"), ("a", "b"), ("a", "d")])
+    assert r.info == "a" and tc.nb_noeuds(r) == 4
+    assert tc.chemin_complet(tc.rechercher(r, "c")) == "a/b/c"
+
+@pytest.mark.parametrize("aretes", [
+    [("x", "y"), ("y", "x")],
+    [("x", "x")],
+    [("a", "b"), ("b", "c"), ("c", "a")],
+])
+def test_construire_depuis_aretes_cycle_sans_racine(aretes):
+    with pytest.raises(ValueError, match="cycle"):
+        tc.construire_depuis_aretes(aretes)
+
+def test_construire_depuis_aretes_cycle_avec_racine():
+    r = tc.constArbre1()
+    avant = tc.nb_noeuds(r)
+    with pytest.raises(ValueError, match="x -> y -> x"):
+        tc.construire_depuis_aretes([("x", "y"), ("y", "x")], racine=r)
+    assert tc.nb_noeuds(r) == avant
+
+# --- Mesures ---
+
+def test_mesurer_temps_retablit_le_ramasse_miettes():
+    import gc
+    def echoue():
+        assert not gc.isenabled()
+        raise RuntimeError
+    with pytest.raises(RuntimeError):
+        tc.mesurer_temps(echoue)
+    assert gc.isenabled()
+
+def test_benchmark_refuse_zero_repetition(capsys):
+    with pytest.raises(ValueError):
+        tc.executer_benchmark([10], repetitions=0)
+    with pytest.raises(SystemExit):
+        tc.main_benchmark(["--repetitions", "0"])
+
+# --- Extraction ---
+
+def test_extraire_par_noeud_rang_et_info_entiere():
+    r = tc.constArbre1()
+    users = r.fils[1]
+    r, ext = tc.extraire(r, noeud=users)
+    assert ext is users and tc.nb_noeuds(r) == 3
+    r = tc.constArbre1()
+    et = tc.EtiquetageIntervalle(r)
+    r, ext = tc.extraire(r, rang=2, etiquettes=et)
+    assert ext.info == "Users"
+    # Une info entière reste une info, même avec un étiquetage
+    r = tc.constArbre1()
+    tc.inserer(r, 7)
+    et = tc.EtiquetageIntervalle(r)
+    r, ext = tc.extraire(r, 7, etiquettes=et)
+    assert ext.info == 7 and tc.rechercher(r, 7) is None
+
+def test_extraire_noeud_etranger():
+    autre = tc.constArbre2()
+    etranger = autre.fils[0]
+    r = tc.constArbre1()
+    for etiquettes in (None, tc.EtiquetageIntervalle(r)):
+        with pytest.raises(ValueError):
+            tc.extraire(r, noeud=etranger, etiquettes=etiquettes)
+    assert autre.fils[0] is etranger and tc.nb_noeuds(autre) == 1 + tc.N + tc.N * tc.N
+
+def test_extraire_cible_ambigue():
+    r = tc.constArbre1()
+    with pytest.raises(ValueError):
+        tc.extraire(r, "Users", noeud=r.fils[1])
+    with pytest.raises(ValueError):
+        tc.extraire(r, rang=1) # Pas d'étiquetage
+
+# --- Motifs de chemins ---
+
+def _infos(noeuds):
+    return sorted(n.info for n in noeuds)
+
+TOUS_ARBRE1 = ["Admin", "C:", "Docs", "Guest", "Images", "Program Files", "Users", "Windows"]
+
+@pytest.mark.parametrize("motif, attendu", [
+    ("**/Docs", ["Docs"]),                      # "**" au début
+    ("**/C:", ["C:"]),                          # ... couvrant zéro niveau
+    ("C:/**/Docs", ["Docs"]),                   # au milieu
+    ("C:/Users/**/Admin", ["Admin"]),           # au milieu, zéro niveau
+    ("C:/**/Admin/*", ["Docs", "Images"]),
+    ("C:/**", TOUS_ARBRE1),                     # à la fin : le noeud lui-même compris
+    ("C:/Users/**", ["Admin", "Docs", "Guest", "Images", "Users"]),
+    ("C:/**/**", TOUS_ARBRE1),
+    ("**", TOUS_ARBRE1),
+    ("C:/Windows/**/Docs", []),
+])
+def test_rechercher_chemins_double_etoile(motif, attendu):
+    assert _infos(tc.rechercher_chemins(tc.constArbre1(), motif)) == attendu
+
+def test_rechercher_chemins_sans_doublon():
+    r = tc.construire_depuis_aretes([("x", "y"), ("y", "x2")])
+    tc.modifier(tc.rechercher(r, "x2"), "x")
+    trouves = list(tc.rechercher_chemins(r, "**/x/**"))
+    assert len(trouves) == len({id(n) for n in trouves}) == 3
+
+# --- Différences entre versions (diff / patch) ---
+
+def _version_editee(arbre, rnd, nb):
+    """Copie de 'arbre' modifiée en place : infos changées, insertions, suppressions, déplacements."""
+    copie = tc._copier_sous_arbre(arbre)
+    for k in range(nb):
+        noeuds = list(tc.iter_bfs(copie))
+        n = rnd.choice(noeuds)
+        choix = k % 4
+        if choix == 0: tc.modifier(n, f"MOD{k}")
+        elif choix == 1: tc.inserer(n, f"AJOUT{k}")
+        elif n is not copie:
+            copie, ext = tc.extraire(copie, noeud=n)
+            if choix == 3:
+                pere = rnd.choice(list(tc.iter_bfs(copie)))
+                tc.greffer(pere, ext) # Échoue sans effet si le père est plein
+    return copie
+
+@pytest.mark.parametrize("graine", range(25))
+def test_appliquer_diff_aller_retour(graine):
+    rnd = random.Random(graine)
+    a = tc.generer_arbre(rnd.randint(1, 150), rnd.choice(["complet", "eventail", "biaise"]), graine=graine)
+    b = _version_editee(a, rnd, rnd.randint(1, 12))
+    reference = tc.empreintes(a)
+    script = tc.diff_arbres(a, b)
+    patche = tc.appliquer_diff(tc._copier_sous_arbre(a), script)
+    assert tc.egalite_structurelle(patche, b)
+    assert tc.empreintes(a) == reference # diff_arbres ne modifie pas l'ancien arbre
+
+def test_appliquer_diff_versions_persistantes():
+    a = tc.const_arbre_aleatoire(400)
+    cibles = [tc.rechercher(a, f"N{i}") for i in range(1, 400, 37)]
+    b = tc._version_modifiee(a, cibles)
+    patche = tc.appliquer_diff(tc._copier_sous_arbre(a), tc.diff_arbres(a, b))
+    assert tc.egalite_structurelle(patche, b)
+
+def test_appliquer_diff_arbres_vides_et_identiques():
+    a = tc.constArbre1()
+    assert tc.diff_arbres(a, a) == []
+    assert tc.diff_arbres(a, tc._copier_sous_arbre(a)) == []
+    assert tc.appliquer_diff(tc._copier_sous_arbre(a), tc.diff_arbres(a, None)) is None
+    assert tc.egalite_structurelle(tc.appliquer_diff(None, tc.diff_arbres(None, a)), a)
+
+# --- Index globaux sous modifications ---
+
+def _lca_naif(a, b):
+    ancetres = {id(n) for n in tc.chemin_vers_racine(a)}
+    return next(n for n in tc.chemin_vers_racine(b) if id(n) in ancetres)
+
+@pytest.mark.parametrize("graine", range(10))
+def test_index_lca_et_etiquetage_apres_modifications(graine):
+    rnd = random.Random(graine)
+    r = tc.generer_arbre(200, "eventail", graine=graine)
+    lca, etiq = tc.IndexLCA(r), tc.EtiquetageIntervalle(r)
+    for k in range(20):
+        noeuds = list(tc.iter_bfs(r))
+        if k % 2: tc.inserer(rnd.choice(noeuds), f"AJOUT{k}")
+        else: r = tc.supprimer(r, rnd.choice(noeuds[1:]).info)
+        noeuds = list(tc.iter_bfs(r))
+        for _ in range(10):
+            a, b = rnd.choice(noeuds), rnd.choice(noeuds)
+            assert lca.lca(a, b) is _lca_naif(a, b)
+            assert etiq.est_ancetre(a, b) == (_lca_naif(a, b) is a)
+        assert etiq.taille(r) == len(noeuds)
+
+def test_index_insensible_aux_autres_arbres():
+    r, autre = tc.constArbre1(), tc.constArbre2()
+    lca = tc.IndexLCA(r)
+    tc.inserer(autre, "AJOUT")
+    assert not lca.est_perime()
+    tc.inserer(r.fils[1], "AJOUT")
+    assert lca.est_perime()
+    ajout = tc.rechercher(r, "AJOUT")
+    assert lca.lca(ajout, tc.rechercher(r, "Docs")) is r.fils[1]
+
+# --- Instantanés (copie des chemins modifiés) ---
+
+@pytest.mark.parametrize("graine", range(10))
+def test_instantane_laisse_l_original_intact(graine):
+    rnd = random.Random(graine)
+    r = tc.const_arbre_aleatoire(300)
+    reference = tc._copier_sous_arbre(r)
+    agregat = tc.agregats(r) # Caches de l'original remplis avant l'instantané
+    cibles = rnd.sample(list(tc.iter_bfs(r))[1:], 6)
+    copie = tc.instantane(r, cibles)
+    # Les cibles sont résolues dans la copie par leurs rangs
+    dans_copie = [tc.suivre_rangs(copie, tc.rangs_depuis(r, c)) for c in cibles]
+    assert all(c is not d for c, d in zip(cibles, dans_copie))
+    tc.modifier(dans_copie[0], "MOD")
+    tc.inserer(dans_copie[1], "AJOUT")
+    copie = tc.supprimer(copie, dans_copie[2].info)
+    copie, _ = tc.extraire(copie, noeud=dans_copie[3])
+    assert tc.egalite_structurelle(r, reference)
+    assert all(c.pere is not None and tc._appartient(r, c) for c in cibles)
+    assert r.agregat is agregat and tc.verifier_agregats(r) == []
+
+def test_instantane_partage_le_reste():
+    r = tc.constArbre1()
+    docs = tc.rechercher(r, "Docs")
+    copie = tc.instantane(r, [docs])
+    assert copie is not r and copie.fils[1] is not r.fils[1]
+    assert copie.fils[0] is r.fils[0] and copie.fils[2] is r.fils[2] # Hors du chemin : partagés
+    assert copie.fils[1].fils[1] is r.fils[1].fils[1]
+
+def test_instantane_cible_etrangere():
+    with pytest.raises(ValueError):
+        tc.instantane(tc.constArbre1(), [tc.constArbre2().fils[0]])
@@ -1,31 +1,177 @@
 import time
 import random
 import sys
+import argparse     # Mode benchmark en ligne de commande
+import concurrent.futures  # Analyse parallèle (pool de processus)
+import threading    # Accès concurrent (écrivain unique)
+import asyncio      # Façade asynchrone de l'accès concurrent
+import csv
+import json
+import math
+import statistics
 import io           # Nécessaire pour la capture des sorties lors de l'évaluation
 import contextlib   # Nécessaire pour créer un contexte silencieux (sans print)
+import mmap         # Projection en mémoire des arbres sauvegardés
+import struct       # En-tête du format binaire
+import tracemalloc  # Pic mémoire des opérations instrumentées
+import hashlib      # Empreintes structurelles (Merkle) des sous-arbres
+import bisect       # Recherche d'une chaîne dans une table sérialisée
+import weakref      # Index globaux à l'écoute des modifications
+import gc           # Ramasse-miettes suspendu pendant les mesures
+import fnmatch      # Motifs glob sur les composants de chemin
+from array import array         # Colonnes contiguës pour le stockage compact
+from collections import deque, OrderedDict   # File FIFO en O(1), cache LRU
+
+try:
+    import numpy as np  # Optionnel : vectorise les opérations de ArbreTableau
+except ImportError:
+    np = None
 
 # ==========================================
 # CONFIGURATION GLOBALE
 # ==========================================
 # On définit le degré de l'arbre (N-aire). Ici N=4 comme demandé dans le sujet.
+# C'est l'arité par défaut : chaque arbre peut avoir la sienne (Noeud(info, arite)).
 N = 4  
-# On augmente la limite de récursion pour éviter les plantages (RecursionError)
-# lors du traitement des arbres profonds (ex: transformation binaire sur 1000 noeuds).
-sys.setrecursionlimit(5000) 
+# À partir de cette arité, les fils sont stockés de façon creuse (FilsCreux)
+SEUIL_CREUX = 64
+# Index construits sur un arbre entier (IndexLCA, EtiquetageIntervalle) encore
+# vivants : signaler_modification les prévient, et seuls ceux dont l'arbre
+# contient le noeud modifié se périment (références faibles).
+_index_a_l_ecoute = weakref.WeakSet()
+# Compteurs d'instrumentation actifs (voir instrumenter) ; None = désactivée.
+# Les boucles chaudes ne testent que cette valeur quand l'instrumentation est coupée.
+compteurs = None
+# Tous les parcours utilisent une pile explicite (voir parcours_profondeur) :
+# la profondeur des arbres n'est limitée que par la mémoire, pas par la pile
+# d'appels de Python (plus besoin de sys.setrecursionlimit).
 
 # ==========================================
 # STRUCTURES DE DONNEES
 # ==========================================
 
+class FilsCreux:
+    """
+    Tableau des fils creux, pour les grandes arités où la plupart des cases sont vides.
+    - cases      : dictionnaire rang -> fils (cases occupées uniquement).
+    - occupation : carte d'occupation (entier Python, bit i = case i occupée).
+    Se comporte comme une liste de taille fixe 'arite' (len, indexation,
+    itération sur toutes les cases, None pour une case vide), si bien que les
+    algorithmes écrits pour la liste dense fonctionnent sans changement.
+    premier_libre() est en O(1) et occupes() ne visite que les cases occupées.
+    """
+    __slots__ = ("arite", "cases", "occupation")
+
+    def __init__(self, arite):
+        self.arite = arite
+        self.cases = {}
+        self.occupation = 0
+
+    def __len__(self):
+        return self.arite
+
+    def _rang(self, i):
+        if i < 0: i += self.arite
+        if not 0 <= i < self.arite: raise IndexError("rang de fils hors limites")
+        return i
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.cases.get(k) for k in range(*i.indices(self.arite))]
+        return self.cases.get(self._rang(i))
+
+    def __setitem__(self, i, fils):
+        i = self._rang(i)
+        if fils is None:
+            self.cases.pop(i, None)
+            self.occupation &= ~(1 << i)
+        else:
+            self.cases[i] = fils
+            self.occupation |= 1 << i
+
+    def __iter__(self):
+        get = self.cases.get
+        return (get(k) for k in range(self.arite))
+
+    def premier_libre(self):
+        """Rang de la première case vide (bit 0 le plus faible), -1 si tout est plein."""
+        occ = self.occupation
+        k = ((occ + 1) & ~occ).bit_length() - 1
+        return k if k < self.arite else -1
+
+    def copier(self):
+        """Copie superficielle (les fils eux-mêmes sont partagés)."""
+        copie = FilsCreux(self.arite)
+        copie.cases, copie.occupation = dict(self.cases), self.occupation
+        return copie
+
+    def occupes(self):
+        """Couples (rang, fils) des cases occupées, par rang croissant."""
+        cases, occ, res = self.cases, self.occupation, []
+        while occ:
+            bas = occ & -occ
+            k = bas.bit_length() - 1
+            res.append((k, cases[k]))
+            occ ^= bas
+        return res
+
+def creer_fils(arite):
+    """Tableau des fils vide : liste dense, ou FilsCreux au-delà de SEUIL_CREUX."""
+    return [None] * arite if arite < SEUIL_CREUX else FilsCreux(arite)
+
+def copier_fils(fils):
+    """Copie superficielle d'un tableau des fils (dense ou creux)."""
+    return fils[:] if type(fils) is list else fils.copier()
+
+def fils_suivant(fils, rang):
+    """
+    Couple (rang, fils) de la première case occupée après 'rang' (-1 : depuis
+    le début), ou None. Sur un tableau creux, saut direct par la carte d'occupation.
+    """
+    if type(fils) is list:
+        for k in range(rang + 1, len(fils)):
+            if fils[k] is not None: return k, fils[k]
+        return None
+    occ = fils.occupation >> (rang + 1)
+    if not occ: return None
+    k = rang + (occ & -occ).bit_length()
+    return k, fils.cases[k]
+
+def premier_libre(fils):
+    """Rang de la première case vide d'un tableau de fils (dense ou creux), -1 sinon."""
+    if type(fils) is list:
+        for i, f in enumerate(fils):
+            if f is None: return i
+        return -1
+    return fils.premier_libre()
+
 class Noeud:
     """
     Représente un noeud d'un arbre N-aire.
     - info : La valeur stockée (chaîne de caractères).
-    - fils : Une liste de taille N contenant les références vers les enfants.
+    - fils : Un tableau de taille 'arite' (N par défaut) contenant les références
+             vers les enfants : liste dense, ou FilsCreux pour les grandes arités.
+    - pere : Référence optionnelle vers le père (None pour une racine ou si
+             le lien n'est pas suivi).
+    - rang : Indice du noeud dans le tableau 'fils' de son père (-1 sinon).
+    - agregat : Cache optionnel des agrégats du sous-arbre (voir agregats()),
+                None s'il n'est pas calculé ou a été invalidé.
+    - empreinte : Cache optionnel de l'empreinte structurelle du sous-arbre
+                  (voir empreintes()), None si elle n'est pas calculée.
+    - noms : Table optionnelle nom -> rangs des fils portant ce nom (voir
+             noms_fils()), None tant qu'aucun chemin n'a été résolu ici.
+    Les liens pere/rang sont maintenus par inserer, adopter_fils, supprimer et
+    extraire ; lier_peres() les (re)calcule pour un arbre construit à la main.
     """
-    def __init__(self, info):
+    def __init__(self, info, arite=N):
         self.info = info
-        self.fils = [None] * N  # Initialisation à None (pas d'enfants)
+        self.fils = creer_fils(arite)  # Initialisation à None (pas d'enfants)
+        self.pere = None
+        self.rang = -1
+        self.agregat = None
+        self.empreinte = None
+        self.noms = None
+        if compteurs is not None: compteurs.noeuds_crees += 1
 
 class NoeudBinaire:
     """
@@ -37,6 +183,250 @@ class NoeudBinaire:
         self.info = info
         self.gauche = None 
         self.droit = None
+        if compteurs is not None: compteurs.binaires_crees += 1
+
+class IndexInfo:
+    """
+    Index optionnel (table de hachage) associant une info à ses noeuds.
+    - table : dictionnaire info -> {id(noeud): noeud}. Le dictionnaire interne
+      gère les doublons (plusieurs noeuds portant la même info) et permet un
+      retrait en O(1).
+    L'index couvre un arbre entier : il doit être passé aux fonctions de
+    modification (inserer, modifier, supprimer, extraire) pour rester à jour.
+    """
+    def __init__(self, racine=None):
+        self.table = {}
+        if racine is not None:
+            self.indexer_sous_arbre(racine)
+
+    def ajouter(self, noeud):
+        """Enregistre un noeud sous son info courante."""
+        self.table.setdefault(noeud.info, {})[id(noeud)] = noeud
+
+    def retirer(self, noeud):
+        """Retire un noeud de l'index (sans effet s'il n'y figure pas)."""
+        groupe = self.table.get(noeud.info)
+        if groupe is not None:
+            groupe.pop(id(noeud), None)
+            if not groupe: del self.table[noeud.info]
+
+    def indexer_sous_arbre(self, r):
+        """
+        Ajoute tous les noeuds du sous-arbre de racine 'r' en ordre préfixe
+        (pile explicite, fils empilés à rebours) : juste après l'indexation,
+        premier(val) désigne le même noeud que rechercher(r, val) sans index.
+        """
+        pile = [r] if r else []
+        while pile:
+            n = pile.pop()
+            self.ajouter(n)
+            pile.extend(f for _, f in reversed(fils_naires(n)))
+
+    def desindexer_sous_arbre(self, r):
+        """Retire tous les noeuds du sous-arbre de racine 'r' (sous-arbre détaché)."""
+        pile = [r] if r else []
+        while pile:
+            n = pile.pop()
+            self.retirer(n)
+            pile.extend(f for _, f in fils_naires(n))
+
+    def vider(self):
+        self.table.clear()
+
+    def premier(self, val):
+        """
+        Retourne le noeud portant 'val' indexé le plus tôt, ou None. O(1).
+        Les doublons sont rangés par ordre d'indexation : ordre préfixe pour
+        un arbre indexé d'un bloc, puis à la suite les noeuds insérés ou
+        renommés (modifier les réindexe) depuis, quelle que soit leur place
+        dans l'arbre. Dans ce cas premier() peut différer du premier noeud
+        trouvé par rechercher() sans index.
+        """
+        groupe = self.table.get(val)
+        if not groupe: return None
+        return next(iter(groupe.values()))
+
+    def tous(self, val):
+        """Retourne la liste de tous les noeuds portant 'val'."""
+        return list(self.table.get(val, {}).values())
+
+    def __len__(self):
+        return sum(len(g) for g in self.table.values())
+
+# ==========================================
+# MOTEUR DE PARCOURS (PILE EXPLICITE)
+# ==========================================
+
+# --- Instrumentation (optionnelle) ---
+
+class Compteurs:
+    """
+    Compteurs relevés pendant une opération instrumentée (voir instrumenter).
+    - visites        : noeuds visités par les parcours (moteur, générateurs, rendu, agrégats).
+    - pic_pile       : taille maximale atteinte par une pile ou une file de parcours.
+    - noeuds_crees   : Noeud alloués.
+    - binaires_crees : NoeudBinaire alloués.
+    - pic_memoire    : pic d'allocation mesuré par tracemalloc (octets).
+    """
+    __slots__ = ("visites", "pic_pile", "noeuds_crees", "binaires_crees", "pic_memoire")
+    CHAMPS = __slots__
+
+    def __init__(self):
+        for champ in self.CHAMPS: setattr(self, champ, 0)
+
+    def visiter(self, taille, nb=1):
+        """Compte 'nb' noeuds visités ; 'taille' est la taille courante de la pile/file."""
+        self.visites += nb
+        if taille > self.pic_pile: self.pic_pile = taille
+
+    def en_dict(self):
+        return {champ: getattr(self, champ) for champ in self.CHAMPS}
+
+# Pic absolu (octets tracés) de chaque bloc instrumenter(memoire=True) ouvert,
+# du plus externe au plus interne : un bloc imbriqué remet à zéro le pic de
+# tracemalloc, le bloc englobant retrouve le sien ici.
+_pics_memoire = []
+
+@contextlib.contextmanager
+def instrumenter(memoire=True):
+    """
+    Active l'instrumentation le temps d'un bloc 'with' et produit les Compteurs.
+    Avec memoire=True, tracemalloc mesure le pic d'allocation du bloc (ce qui
+    ralentit fortement l'exécution : ne pas chronométrer en même temps).
+    Un bloc imbriqué a ses propres compteurs ; à sa sortie, ils sont ajoutés à
+    ceux du bloc englobant (maximum pour les pics de pile et de mémoire).
+    """
+    global compteurs
+    precedents, c = compteurs, Compteurs()
+    demarre = memoire and not tracemalloc.is_tracing()
+    if demarre: tracemalloc.start()
+    if memoire:
+        actuel, pic = tracemalloc.get_traced_memory()
+        # Le pic du bloc englobant est sauvegardé avant la remise à zéro
+        if _pics_memoire: _pics_memoire[-1] = max(_pics_memoire[-1], pic)
+        tracemalloc.reset_peak()
+        base = actuel
+        _pics_memoire.append(actuel)
+    compteurs = c
+    try:
+        yield c
+    finally:
+        compteurs = precedents
+        if memoire:
+            pic = max(_pics_memoire.pop(), tracemalloc.get_traced_memory()[1])
+            c.pic_memoire = max(0, pic - base)
+            if _pics_memoire: _pics_memoire[-1] = max(_pics_memoire[-1], pic)
+        if demarre: tracemalloc.stop()
+        if precedents is not None:
+            precedents.visites += c.visites
+            precedents.noeuds_crees += c.noeuds_crees
+            precedents.binaires_crees += c.binaires_crees
+            if c.pic_pile > precedents.pic_pile: precedents.pic_pile = c.pic_pile
+
+# Valeurs de retour spéciales des visiteurs
+ARRET = object()    # Interrompt tout le parcours (sortie anticipée)
+ELAGUER = object()  # Ne descend pas dans le sous-arbre du noeud courant
+
+def fils_naires(noeud):
+    """Couples (rang, fils) des cases occupées d'un Noeud, par rang croissant."""
+    fils = noeud.fils
+    if type(fils) is list:
+        return [(i, f) for i, f in enumerate(fils) if f is not None]
+    return fils.occupes()
+
+def fils_binaires(b):
+    """Fils d'un NoeudBinaire : gauche au rang 0, droit au rang 1."""
+    res = []
+    if b.gauche is not None: res.append((0, b.gauche))
+    if b.droit is not None: res.append((1, b.droit))
+    return res
+
+def parcours_profondeur(racine, pre=None, post=None, enfants=fils_naires):
+    """
+    Parcours en profondeur générique, sans récursion (pile explicite).
+    - pre(noeud, pere, rang, prof)  : appelé à l'entrée du noeud (ordre préfixe).
+      Peut retourner ARRET (fin du parcours) ou ELAGUER (sous-arbre ignoré).
+    - post(noeud, pere, rang, prof) : appelé à la sortie du noeud (ordre postfixe),
+      après tous ses descendants. Peut retourner ARRET.
+    - enfants(noeud) : fonction donnant la liste des couples (rang, fils) des
+      cases occupées ; les cases vides ne sont jamais parcourues.
+    Les fils sont visités dans l'ordre de leurs cases.
+    Retourne True si le parcours a été interrompu par ARRET, False sinon.
+    """
+    if racine is None: return False
+    c = compteurs
+    pile = [(racine, None, -1, 0, False)]
+    while pile:
+        noeud, pere, rang, prof, sortie = pile.pop()
+        if sortie:
+            if post(noeud, pere, rang, prof) is ARRET: return True
+            continue
+        if c is not None: c.visiter(len(pile) + 1)
+        if pre is not None:
+            action = pre(noeud, pere, rang, prof)
+            if action is ARRET: return True
+            if action is ELAGUER: continue
+        if post is not None:
+            pile.append((noeud, pere, rang, prof, True))
+        for i, f in reversed(enfants(noeud)):
+            pile.append((f, noeud, i, prof + 1, False))
+    return False
+
+# --- Parcours paresseux (générateurs) ---
+# Les noeuds sont produits au fur et à mesure : l'appelant peut filtrer ou
+# s'arrêter à tout moment sans construire de liste. Avec details=True, chaque
+# élément est un quadruplet (noeud, prof, pere, rang).
+
+def iter_dfs_pre(racine, details=False, enfants=fils_naires):
+    """Génère les noeuds en ordre préfixe (profondeur d'abord)."""
+    if racine is None: return
+    c = compteurs
+    pile = deque([(racine, 0, None, -1)])
+    while pile:
+        if c is not None: c.visiter(len(pile))
+        elem = pile.pop()
+        noeud, prof = elem[0], elem[1]
+        yield elem if details else noeud
+        for i, f in reversed(enfants(noeud)):
+            pile.append((f, prof + 1, noeud, i))
+
+def iter_dfs_post(racine, details=False, enfants=fils_naires):
+    """Génère les noeuds en ordre postfixe (un noeud après tous ses descendants)."""
+    if racine is None: return
+    c = compteurs
+    pile = deque([(racine, 0, None, -1, False)])
+    while pile:
+        noeud, prof, pere, rang, sortie = pile.pop()
+        if sortie:
+            yield (noeud, prof, pere, rang) if details else noeud
+            continue
+        if c is not None: c.visiter(len(pile) + 1)
+        pile.append((noeud, prof, pere, rang, True))
+        for i, f in reversed(enfants(noeud)):
+            pile.append((f, prof + 1, noeud, i, False))
+
+def iter_bfs(racine, details=False, enfants=fils_naires):
+    """Génère les noeuds en ordre de largeur (niveau par niveau, file FIFO)."""
+    if racine is None: return
+    c = compteurs
+    file = deque([(racine, 0, None, -1)])
+    while file:
+        if c is not None: c.visiter(len(file))
+        elem = file.popleft() # Défiler (FIFO) en O(1)
+        noeud, prof = elem[0], elem[1]
+        yield elem if details else noeud
+        for i, f in enfants(noeud):
+            file.append((f, prof + 1, noeud, i))
+
+def iter_levels(racine, enfants=fils_naires):
+    """Génère les niveaux successifs sous forme de couples (prof, [noeuds])."""
+    c = compteurs
+    niveau, prof = ([racine] if racine is not None else []), 0
+    while niveau:
+        if c is not None: c.visiter(len(niveau), len(niveau))
+        yield prof, niveau
+        niveau = [f for n in niveau for _, f in enfants(n)]
+        prof += 1
 
 # ==========================================
 # 1. CONSTRUCTION ET GENERATEURS
@@ -68,6 +458,7 @@ def constArbre1():
     # Niveau 3 (Sous-dossiers de Admin)
     r.fils[1].fils[0].fils[0] = Noeud("Docs")
     r.fils[1].fils[0].fils[1] = Noeud("Images")
+    lier_peres(r)
     return r
 
 def constArbre2():
@@ -80,90 +471,453 @@ def constArbre2():
         r.fils[i] = Noeud(f"N1_Fils{i}")
         for j in range(N):
             r.fils[i].fils[j] = Noeud(f"N2_Fils{i}-{j}")
+    lier_peres(r)
     return r
 
-def const_arbre_aleatoire(nb_noeuds):
+def const_arbre_chaine(nb_noeuds, arite=N):
+    """
+    Génère un arbre dégénéré (chaîne) : chaque noeud a un seul fils (case 0).
+    Cas le plus profond possible (hauteur = nb_noeuds), utile pour vérifier que
+    les parcours ne dépendent pas de la pile d'appels.
+    """
+    return generer_arbre(nb_noeuds, "chaine", arite)
+
+def const_arbre_aleatoire(nb_noeuds, arite=N):
+    """
+    Génère un arbre de taille 'nb_noeuds' et d'arité 'arite' rempli niveau par
+    niveau (largeur), de gauche à droite : structure équilibrée pour les tests.
+    Les noeuds sont nommés "Root", puis "N<i>" dans l'ordre de largeur.
+    """
+    return generer_arbre(nb_noeuds, "complet", arite)
+
+# --- Générateur rapide (indices implicites, graine fixe) ---
+# Les noeuds sont numérotés dans l'ordre de largeur : les fils d'un noeud ont
+# des numéros consécutifs, si bien qu'un arbre est entièrement décrit par le
+# couple (père, rang) de chaque noeud 1..n-1. Pour la forme "complet", le k-ième
+# fils du noeud i est le noeud arite*i + k + 1 (aucun tirage). Les autres formes
+# tirent le nombre de fils de chaque noeud avec random.Random(graine) : le même
+# appel produit le même arbre d'une exécution (et d'une machine) à l'autre.
+
+FORMES_GENERATEUR = ("complet", "eventail", "biaise", "chaine", "galton_watson")
+
+class NomsGeneres:
+    """Table des infos "Root", "N1", "N2"... calculées à la demande (aucune chaîne stockée)."""
+    def __init__(self, nb):
+        self.nb = nb
+
+    def __len__(self):
+        return self.nb
+
+    def __getitem__(self, i):
+        i = int(i)
+        if not 0 <= i < self.nb: raise IndexError("indice d'info hors limites")
+        return f"N{i}" if i else "Root"
+
+    def indice(self, val):
+        """Indice de l'info 'val' ("Root" ou "N<i>" sous forme canonique), ou -1."""
+        if val == "Root": return 0 if self.nb else -1
+        if not isinstance(val, str) or val[:1] != "N": return -1
+        chiffres = val[1:]
+        if not (chiffres.isascii() and chiffres.isdigit()) or chiffres[0] == "0": return -1
+        i = int(chiffres)
+        return i if i < self.nb else -1
+
+def _plan_eventail(nb_noeuds, arite, rnd):
+    """Chaque case est occupée avec probabilité 1/2 : un tirage de 'arite' bits par noeud."""
+    if arite <= 16:
+        masques = [tuple(k for k in range(arite) if m >> k & 1) for m in range(1 << arite)]
+        tirer = lambda: masques[rnd.getrandbits(arite)]
+    else:
+        def tirer():
+            m = rnd.getrandbits(arite)
+            return [k for k in range(arite) if m >> k & 1]
+    peres, rangs = array('i'), array('i')
+    crees, i = 1, 0
+    while crees < nb_noeuds:
+        cases = tirer()
+        if not cases and i == crees - 1: cases = (0,) # La frontière ne doit pas s'éteindre
+        if len(cases) > nb_noeuds - crees: cases = cases[:nb_noeuds - crees]
+        peres.extend([i] * len(cases))
+        rangs.extend(cases)
+        crees += len(cases)
+        i += 1
+    return peres, rangs
+
+def _plan_biaise(nb_noeuds, arite, rnd, alpha=1.5):
+    """
+    Nombre de fils à queue lourde (Pareto d'indice 'alpha', moins 1) : surtout
+    0 ou 1 fils, parfois beaucoup ; fils tassés à gauche (arbres profonds et déséquilibrés).
+    """
+    alea, exposant = rnd.random, -1.0 / alpha
+    peres, rangs = array('i'), array('i')
+    crees, i = 1, 0
+    while crees < nb_noeuds:
+        nb = min(int((1.0 - alea()) ** exposant) - 1, arite, nb_noeuds - crees)
+        if nb == 0 and i == crees - 1: nb = 1 # La frontière ne doit pas s'éteindre
+        if nb:
+            peres.extend([i] * nb)
+            rangs.extend(range(nb))
+            crees += nb
+        i += 1
+    return peres, rangs
+
+def _plan_galton_watson(nb_noeuds, arite, rnd):
+    """
+    Processus de Galton-Watson critique : chaque case est occupée avec
+    probabilité 1/arite, soit B(arite, 1/arite) fils par noeud. Les cases
+    occupées sont tirées directement par sauts géométriques : un tirage par
+    noeud créé, quelle que soit l'arité.
+    """
+    if arite == 1: return _plan_arbre(nb_noeuds, "chaine", 1, 0)
+    alea, log, log_q = rnd.random, math.log, math.log1p(-1.0 / arite)
+    peres, rangs = array('i'), array('i')
+    crees, pos = 1, -1 # pos = arite * noeud + case de la dernière case occupée
+    while crees < nb_noeuds:
+        pos += 1 + int(log(1.0 - alea()) / log_q)
+        i, k = divmod(pos, arite)
+        if i >= crees: # La frontière s'est éteinte : le dernier noeud reçoit un fils
+            i, k = crees - 1, 0
+            pos = i * arite
+        peres.append(i)
+        rangs.append(k)
+        crees += 1
+    return peres, rangs
+
+def _plan_arbre(nb_noeuds, forme, arite, graine):
+    """
+    Colonnes (peres, rangs) des noeuds 1..n-1 dans l'ordre de largeur, en O(n).
+    Pour les formes aléatoires, un noeud qui serait le dernier de la frontière
+    reçoit au moins un fils : l'arbre atteint toujours 'nb_noeuds' noeuds.
+    """
+    if forme == "complet":
+        if np is not None:
+            j = np.arange(nb_noeuds - 1, dtype=np.int32)
+            return j // arite, j % arite
+        return array('i', (j // arite for j in range(nb_noeuds - 1))), \
+               array('i', (j % arite for j in range(nb_noeuds - 1)))
+    if forme == "chaine":
+        return array('i', range(nb_noeuds - 1)), array('i', [0]) * (nb_noeuds - 1)
+    plans = {"eventail": _plan_eventail, "biaise": _plan_biaise, "galton_watson": _plan_galton_watson}
+    return plans[forme](nb_noeuds, arite, random.Random(graine))
+
+def generer_arbre(nb_noeuds, forme="complet", arite=N, graine=0, sortie="noeuds"):
     """
-    Génère un arbre aléatoire de taille 'nb_noeuds'.
-    Utilise une file (FIFO) pour remplir l'arbre niveau par niveau (largeur)
-    afin d'avoir une structure relativement équilibrée pour les tests.
+    Génère en O(n) un arbre de 'nb_noeuds' noeuds de la forme demandée
+    (FORMES_GENERATEUR), reproductible pour une graine donnée.
+    - sortie="noeuds"  : arbre de Noeud (liens pere/rang compris), noms "Root", "N<i>".
+    - sortie="tableau" : ArbreTableau construit directement (sans aucun Noeud),
+      avec une table d'infos calculées à la demande (NomsGeneres).
+    """
+    if forme not in FORMES_GENERATEUR:
+        raise ValueError(f"Forme inconnue : {forme} (formes : {', '.join(FORMES_GENERATEUR)})")
+    if nb_noeuds == 0: return None if sortie == "noeuds" else ArbreTableau.depuis_noeuds(None, arite)
+    peres, rangs = _plan_arbre(nb_noeuds, forme, arite, graine)
+    if sortie == "tableau":
+        if np is not None:
+            table = np.full((nb_noeuds, arite), -1, dtype=np.int32)
+            table[np.asarray(peres, dtype=np.intp), np.asarray(rangs, dtype=np.intp)] = \
+                np.arange(1, nb_noeuds, dtype=np.int32)
+            ids = np.arange(nb_noeuds, dtype=np.int32)
+        else:
+            table = array('i', [-1]) * (nb_noeuds * arite)
+            for j, (p, k) in enumerate(zip(peres, rangs), 1): table[p * arite + k] = j
+            ids = array('i', range(nb_noeuds))
+        return ArbreTableau(ids, table, NomsGeneres(nb_noeuds), arite)
+    if sortie != "noeuds": raise ValueError(f"Sortie inconnue : {sortie}")
+    if np is not None and isinstance(peres, np.ndarray): peres, rangs = peres.tolist(), rangs.tolist()
+    noeuds = [Noeud("Root", arite)]
+    for j, (p, k) in enumerate(zip(peres, rangs), 1):
+        pere = noeuds[p]
+        f = Noeud(f"N{j}", arite)
+        pere.fils[k] = f
+        f.pere, f.rang = pere, k
+        noeuds.append(f)
+    return noeuds[0]
+
+def const_arbre_motifs(nb_noeuds, arite=N):
+    """
+    Même remplissage en largeur que const_arbre_aleatoire, mais chaque noeud
+    porte l'info "M<profondeur>" : tous les sous-arbres pleins d'un même niveau
+    sont identiques (cas favorable au partage, voir canoniser).
     """
     if nb_noeuds == 0: return None
-    racine = Noeud("Root")
-    file_attente = [racine] # File pour le remplissage en largeur
-    count = 1 # Compteur de noeuds créés
-    
-    while count < nb_noeuds and file_attente:
-        pere = file_attente[0]
-        # On essaie de remplir les N fils du père courant
-        for i in range(N):
-            if count >= nb_noeuds: break # Arrêt si on a atteint la taille cible
-            if pere.fils[i] is None:
-                nouveau = Noeud(f"N{count}")
-                pere.fils[i] = nouveau
-                file_attente.append(nouveau) # On ajoute le nouveau noeud à la file
-                count += 1
-        
-        # Si le père est plein, on le retire de la file pour passer au suivant
-        if all(f is not None for f in pere.fils):
-            file_attente.pop(0)
-            
+    racine = Noeud("M0", arite)
+    file_attente = deque([(racine, 0)])
+    count = 1
+    while count < nb_noeuds:
+        pere, prof = file_attente.popleft()
+        for i in range(min(arite, nb_noeuds - count)):
+            nouveau = Noeud(f"M{prof + 1}", arite)
+            pere.fils[i] = nouveau
+            nouveau.pere, nouveau.rang = pere, i
+            file_attente.append((nouveau, prof + 1))
+            count += 1
+    return racine
+
+# --- Construction en masse ---
+
+def _greffer(pere, enfant, libres):
+    """
+    Attache 'enfant' dans la première case libre de 'pere'. libres[id(pere)] est
+    un curseur sur la prochaine case à examiner : chaque case n'est testée
+    qu'une fois sur toute la durée d'une construction en masse. Un tableau creux
+    trouve directement sa première case libre.
+    """
+    fils = pere.fils
+    if type(fils) is list:
+        k = libres.get(id(pere), 0)
+        while k < len(fils) and fils[k] is not None: k += 1
+    else:
+        k = fils.premier_libre()
+        if k < 0: k = len(fils)
+    if k == len(fils):
+        raise ValueError(f"Le noeud '{pere.info}' a déjà {len(fils)} fils")
+    fils[k] = enfant
+    enfant.pere, enfant.rang = pere, k
+    _noms_ajouter(pere, enfant)
+    libres[id(pere)] = k + 1
+
+def _refuser_cycle(pere, enfant):
+    """ValueError si 'enfant' (un noeud en attente) est un ancêtre de 'pere' : l'arête fermerait un cycle."""
+    chemin, n = [], pere
+    while n is not None:
+        chemin.append(n.info)
+        if n is enfant:
+            cycle = " -> ".join(map(str, reversed(chemin)))
+            raise ValueError(f"Les arêtes forment un cycle : {cycle} -> {enfant.info}")
+        n = n.pere
+
+def construire_depuis_aretes(aretes, racine=None, index=None, arite=None):
+    """
+    Construit (ou étend, si 'racine' est fournie) un arbre en une seule passe
+    sur un itérable de couples (info_pere, info_fils), sans aucune recherche.
+    Une table temporaire info -> noeud remplace rechercher ; si une info est
+    répétée, la dernière occurrence l'emporte. Un père peut apparaître avant
+    d'avoir été lui-même rattaché : il reste en attente jusqu'à son arête.
+    Les noeuds créés ont l'arité 'arite' (par défaut celle de 'racine', sinon N).
+    Retourne la racine ; ValueError si les arêtes ne forment pas un seul arbre
+    (un cycle est signalé dès l'arête qui le ferme, avec les infos concernées).
+    En cas d'erreur sur un arbre existant, les arêtes déjà traitées restent
+    greffées, mais caches, index globaux et 'index' sont mis à jour comme en
+    cas de succès : l'arbre reste cohérent.
+    """
+    if arite is None: arite = len(racine.fils) if racine is not None else N
+    table, orphelins, libres, crees, touches = {}, {}, {}, set(), {}
+    if racine is not None:
+        for n in iter_dfs_pre(racine): table[n.info] = n
+    try:
+        for info_pere, info_fils in aretes:
+            pere = table.get(info_pere)
+            if pere is None:
+                # Père inconnu : créé en attente de son propre rattachement
+                pere = table[info_pere] = orphelins[info_pere] = Noeud(info_pere, arite)
+                crees.add(id(pere))
+            enfant = orphelins.pop(info_fils, None)
+            if enfant is None:
+                enfant = Noeud(info_fils, arite)
+                crees.add(id(enfant))
+            else: _refuser_cycle(pere, enfant)
+            table[info_fils] = enfant
+            _greffer(pere, enfant, libres)
+            if id(pere) not in crees: touches[id(pere)] = pere
+    finally:
+        # Les pères déjà présents dans l'arbre signalent la modification une
+        # seule fois, y compris si une arête invalide a interrompu la boucle
+        if racine is not None:
+            for pere in touches.values():
+                signaler_modification(pere)
+                if index is not None:
+                    for _, f in fils_naires(pere):
+                        if id(f) in crees: index.indexer_sous_arbre(f)
+    if racine is None:
+        if len(orphelins) != 1:
+            raise ValueError(f"Les arêtes forment {len(orphelins)} arbres au lieu d'un")
+        racine = next(iter(orphelins.values()))
+        if index is not None: index.indexer_sous_arbre(racine)
+        return racine
+    if orphelins:
+        raise ValueError(f"Pères introuvables : {', '.join(map(str, orphelins))}")
+    return racine
+
+def construire_depuis_chemins(enregistrements, racine=None, separateur="/", index=None, arite=None):
+    """
+    Construit (ou étend) un arbre à partir d'enregistrements (chemin_pere, info).
+    Le chemin (chaîne "C:/Users/Admin" ou séquence de noms) part de la racine ;
+    les dossiers intermédiaires manquants sont créés. Un chemin vide désigne la
+    racine elle-même. Les fils d'un noeud sont mis en table (nom -> fils) au
+    premier passage, puis chaque composant est résolu en O(1). Les noeuds créés
+    ont l'arité 'arite' (par défaut celle de 'racine', sinon N).
+    Si un enregistrement est invalide (ValueError), ceux déjà traités restent
+    greffés et les caches des pères touchés sont tout de même invalidés.
+    """
+    if arite is None: arite = len(racine.fils) if racine is not None else N
+    enfants = {}  # (id(pere), nom) -> fils
+    vus, libres, touches = set(), {}, {}
+    def fils_nomme(pere, nom):
+        if id(pere) not in vus:
+            vus.add(id(pere))
+            for _, f in fils_naires(pere):
+                enfants.setdefault((id(pere), f.info), f)
+        f = enfants.get((id(pere), nom))
+        if f is None:
+            f = Noeud(nom, arite)
+            _greffer(pere, f, libres) # Peut échouer : rien n'est enregistré avant
+            enfants[(id(pere), nom)] = f
+            touches[id(pere)] = pere
+            if index is not None: index.ajouter(f)
+        return f
+    try:
+        for chemin_pere, info in enregistrements:
+            noms = _composants(chemin_pere, separateur)
+            if not noms:
+                if racine is None:
+                    racine = Noeud(info, arite)
+                    if index is not None: index.ajouter(racine)
+                elif racine.info != info:
+                    raise ValueError(f"Racine '{racine.info}' différente de '{info}'")
+                continue
+            if racine is None:
+                racine = Noeud(noms[0], arite)
+                if index is not None: index.ajouter(racine)
+            elif racine.info != noms[0]:
+                raise ValueError(f"Le chemin '{separateur.join(noms)}' ne part pas de la racine '{racine.info}'")
+            pere = racine
+            for nom in noms[1:]:
+                pere = fils_nomme(pere, nom)
+            fils_nomme(pere, info)
+    finally:
+        for pere in touches.values(): signaler_modification(pere)
     return racine
 
 # ==========================================
 # 2. AFFICHAGE (VISUALISATION)
 # ==========================================
 
+# Taille (en caractères) à partir de laquelle le tampon est écrit dans le flux
+TAILLE_TAMPON = 1 << 16
+
+class TamponSortie:
+    """
+    Tampon d'écriture par blocs vers un flux texte.
+    Les fragments sont accumulés par référence (sans concaténation) puis écrits
+    en un seul appel 'write' dès que leur volume dépasse 'taille'.
+    """
+    def __init__(self, flux, taille=TAILLE_TAMPON):
+        self.flux = flux
+        self.taille = taille
+        self.fragments = []
+        self.volume = 0
+
+    def ecrire(self, *fragments):
+        self.fragments.extend(fragments)
+        self.volume += sum(map(len, fragments))
+        if self.volume >= self.taille: self.vider()
+
+    def vider(self):
+        if self.fragments:
+            self.flux.write("".join(self.fragments))
+            self.fragments.clear()
+            self.volume = 0
+
+# Connecteurs : (drapeau vrai, drapeau faux, préfixe des fils si vrai, si faux)
+SYMBOLES_NAIRE = ("└── ", "├── ", "    ", "│   ")   # drapeau = dernier fils
+SYMBOLES_BINAIRE = ("|-- ", "L-- ", "|   ", "    ")  # drapeau = fils gauche
+
+def _ecrire_arbre(racine, flux, prefix, drapeau_racine, binaire, profondeur_max, noeuds_max):
+    """
+    Moteur commun de rendu ASCII (parcours préfixe, pile explicite).
+    - prefixes[d] : préfixe partagé par tous les noeuds de profondeur d ; il est
+      construit une seule fois par père et n'est jamais recopié ligne par ligne.
+    - derniers[d] : rang du dernier fils occupé du père des noeuds de profondeur d.
+    Retourne le nombre de noeuds écrits.
+    """
+    if flux is None: flux = sys.stdout
+    conn_vrai, conn_faux, seg_vrai, seg_faux = SYMBOLES_BINAIRE if binaire else SYMBOLES_NAIRE
+    enfants = fils_binaires if binaire else fils_naires
+    tampon = TamponSortie(flux)
+    prefixes, derniers = [prefix], [-1]
+    ecrits = 0
+    c = compteurs
+    pile = [(racine, 0, -1)] if racine is not None else []
+    while pile:
+        if c is not None: c.visiter(len(pile))
+        n, prof, rang = pile.pop()
+        if noeuds_max is not None and ecrits >= noeuds_max:
+            tampon.ecrire(prefix, "... (affichage tronqué)\n")
+            break
+        if prof == 0: drapeau = drapeau_racine
+        elif binaire: drapeau = rang == 0
+        else: drapeau = rang == derniers[prof]
+        pref = prefixes[prof]
+        cases = enfants(n)
+        coupe = profondeur_max is not None and prof >= profondeur_max
+        suite = " [...]\n" if coupe and cases else "\n"
+        tampon.ecrire(pref, conn_vrai if drapeau else conn_faux, str(n.info), suite)
+        ecrits += 1
+        if coupe: continue
+        # Préparation du préfixe (et du dernier rang occupé) des fils
+        del prefixes[prof + 1:]
+        prefixes.append(pref + (seg_vrai if drapeau else seg_faux))
+        del derniers[prof + 1:]
+        derniers.append(cases[-1][0] if cases else -1)
+        for i, f in reversed(cases): pile.append((f, prof + 1, i))
+    tampon.vider()
+    return ecrits
+
+def ecrire_arborescence(racine, flux=None, profondeur_max=None, noeuds_max=None,
+                        sous_arbre=None, prefix="", is_last=True):
+    """
+    Écrit l'arbre (style commande 'tree') dans un flux texte quelconque
+    (sys.stdout par défaut, ou un fichier ouvert) via un tampon par blocs.
+    - profondeur_max : les noeuds plus profonds sont omis (marque ' [...]').
+    - noeuds_max     : arrêt après ce nombre de noeuds (ligne '... (affichage tronqué)').
+    - sous_arbre     : noeud de départ optionnel à la place de 'racine'.
+    Retourne le nombre de noeuds écrits.
+    """
+    depart = sous_arbre if sous_arbre is not None else racine
+    return _ecrire_arbre(depart, flux, prefix, is_last, False, profondeur_max, noeuds_max)
+
+def ecrire_binaire(b, flux=None, profondeur_max=None, noeuds_max=None, prefix="", is_left=True):
+    """Équivalent de ecrire_arborescence pour un arbre binaire (transfo_binaire)."""
+    return _ecrire_arbre(b, flux, prefix, is_left, True, profondeur_max, noeuds_max)
+
 def afficher_arborescence(noeud, prefix="", is_last=True):
     """
     Affiche l'arbre de manière graphique dans la console (style commande 'tree').
-    Algorithme récursif (DFS) gérant l'indentation et les caractères de liaison.
+    Parcours préfixe (DFS) gérant l'indentation et les caractères de liaison,
+    écrit par blocs via ecrire_arborescence.
     """
-    if noeud is not None:
-        # Choix du connecteur selon si c'est le dernier enfant ou non
-        branche = "└── " if is_last else "├── "
-        print(prefix + branche + str(noeud.info))
-        
-        # Préparation du préfixe pour les appels récursifs
-        new_prefix = prefix + ("    " if is_last else "│   ")
-        
-        # On récupère uniquement les fils existants
-        enfants = [f for f in noeud.fils if f is not None]
-        count = len(enfants)
-        
-        for i, enfant in enumerate(enfants):
-            is_last_child = (i == count - 1)
-            afficher_arborescence(enfant, new_prefix, is_last_child)
+    ecrire_arborescence(noeud, sys.stdout, prefix=prefix, is_last=is_last)
 
 def afficher_parcours(racine):
     """
     Effectue et affiche les deux types de parcours classiques :
-    1. DFS (Profondeur) : Utilise une pile explicite.
-    2. BFS (Largeur) : Utilise une file explicite.
-    """
-    # --- Parcours en Profondeur (DFS) ---
-    res_dfs = []
-    def dfs_rec(n):
-        if n:
-            res_dfs.append(n.info)
-            for f in n.fils: dfs_rec(f)
-    dfs_rec(racine)
-    print("Parcours Profondeur (DFS) : " + " -> ".join(res_dfs))
-    
-    # --- Parcours en Largeur (BFS) ---
-    res_bfs = []
-    if racine:
-        file = [racine]
-        while file:
-            curr = file.pop(0) # Défiler (FIFO)
-            res_bfs.append(curr.info)
-            for f in curr.fils:
-                if f: file.append(f)
-    print("Parcours Largeur    (BFS) : " + " -> ".join(res_bfs))
+    1. DFS (Profondeur) : Utilise une pile explicite (iter_dfs_pre).
+    2. BFS (Largeur) : Utilise une file explicite (iter_bfs).
+    Les noeuds sont écrits au fil du parcours, sans liste intermédiaire.
+    """
+    for titre, parcours in (("Parcours Profondeur (DFS) : ", iter_dfs_pre),
+                            ("Parcours Largeur    (BFS) : ", iter_bfs)):
+        sortie = sys.stdout
+        sortie.write(titre)
+        for i, n in enumerate(parcours(racine)):
+            if i: sortie.write(" -> ")
+            sortie.write(n.info)
+        sortie.write("\n")
 
-def afficher_sous_arbre(racine, adr_a):
-    """Affiche uniquement le sous-arbre partant du noeud 'adr_a'."""
-    if adr_a: afficher_arborescence(adr_a)
+def afficher_sous_arbre(racine, adr_a, etiquettes=None):
+    """
+    Affiche uniquement le sous-arbre partant du noeud 'adr_a'.
+    Avec un EtiquetageIntervalle de 'racine', 'adr_a' peut aussi être un numéro
+    d'entrée (rang préfixe) et le sous-arbre est lu dans sa tranche contiguë de
+    l'étiquetage, sans parcourir les tableaux de fils.
+    """
+    if adr_a is None: return
+    if etiquettes is not None and etiquettes.racine is racine:
+        if isinstance(adr_a, int): adr_a = etiquettes.kieme(adr_a)
+        etiquettes.ecrire_sous_arbre(adr_a, sys.stdout)
+    else:
+        ecrire_arborescence(racine, sys.stdout, sous_arbre=adr_a)
 
 # ==========================================
 # 3. ALGORITHMES (OPERATIONS DU SUJET)
@@ -171,103 +925,369 @@ def afficher_sous_arbre(racine, adr_a):
 
 def hauteur(r):
     """
-    Calcule la hauteur de l'arbre de manière récursive.
+    Calcule la hauteur de l'arbre (nombre de niveaux).
     Complexité : O(n) car on visite tous les noeuds.
-    Formule : 1 + max(hauteur des fils).
+    Formule : 1 + profondeur maximale atteinte par le parcours.
     """
     if not r: return 0
-    return 1 + max((hauteur(f) for f in r.fils), default=0)
+    prof_max = [0]
+    def visiter(n, pere, rang, prof):
+        if prof > prof_max[0]: prof_max[0] = prof
+    parcours_profondeur(r, visiter)
+    return 1 + prof_max[0]
 
-def rechercher(r, val):
+def rechercher(r, val, index=None):
     """
     Recherche un noeud contenant 'val' et retourne son adresse (référence).
     Parcours en profondeur d'abord.
+    Si un IndexInfo couvrant l'arbre de racine 'r' est fourni, la recherche
+    devient une simple consultation de la table de hachage en O(1).
     """
     if not r: return None
-    if r.info == val: return r
-    for f in r.fils:
-        res = rechercher(f, val)
-        if res: return res
-    return None
+    if index is not None: return index.premier(val)
+    trouve = []
+    def visiter(n, pere, rang, prof):
+        if n.info == val:
+            trouve.append(n)
+            return ARRET # Sortie anticipée dès le premier noeud trouvé
+    parcours_profondeur(r, visiter)
+    return trouve[0] if trouve else None
 
 def chemin(a, b, path=None):
     """
     Affiche le chemin menant du noeud 'a' au noeud 'b'.
-    Utilise le Backtracking : on construit le chemin et on annule si c'est une impasse.
+    Si les liens vers le père sont disponibles, on remonte de 'b' vers 'a' en
+    O(profondeur). Sinon (ou si 'a' n'est pas rencontré), on utilise le
+    Backtracking : on construit le chemin et on annule si c'est une impasse.
     """
-    if path is None: path = []
+    if path is None:
+        path = []
+        montee = remonter_jusqua(b, a) if a and b else None
+        if montee is not None:
+            print("Chemin trouvé : " + " -> ".join(n.info for n in reversed(montee)))
+            return True
     if not a: return False
-    path.append(a.info)
     
-    if a == b: 
-        print("Chemin trouvé : " + " -> ".join(path))
-        return True
+    def entrer(n, pere, rang, prof):
+        path.append(n.info)
+        if n == b:
+            print("Chemin trouvé : " + " -> ".join(path))
+            return ARRET
     
-    for f in a.fils:
-        if chemin(f, b, path): return True
+    def sortir(n, pere, rang, prof):
+        # Backtracking : ce noeud ne mène pas à b, on le retire du chemin
+        path.pop()
     
-    # Backtracking : ce noeud ne mène pas à b, on le retire du chemin
-    path.pop()
-    return False
+    return parcours_profondeur(a, entrer, sortir)
 
-def inserer(pere, info):
+def inserer(pere, info, index=None):
     """
-    Insère un nouveau noeud comme fils du noeud 'pere'.
+    Insère un nouveau noeud (de même arité que 'pere') comme fils du noeud 'pere'.
     Trouve la première case vide (None) dans le tableau des fils.
     """
     if not pere: return False
-    for i in range(N):
-        if pere.fils[i] is None:
-            pere.fils[i] = Noeud(info)
-            return True
-    return False
+    i = premier_libre(pere.fils)
+    if i < 0: return False
+    f = pere.fils[i] = Noeud(info, len(pere.fils))
+    f.pere, f.rang = pere, i
+    _noms_ajouter(pere, f)
+    if index is not None: index.ajouter(f)
+    signaler_modification(pere)
+    return True
 
-def modifier(noeud, info):
+def modifier(noeud, info, index=None):
     """Modifie l'information contenue dans un noeud existant."""
-    if noeud: noeud.info = info
+    if noeud:
+        if index is not None: index.retirer(noeud)
+        lie = lien_valide(noeud)
+        if lie: _noms_retirer(noeud.pere, noeud.rang, noeud.info)
+        noeud.info = info
+        if lie: _noms_ajouter(noeud.pere, noeud)
+        if index is not None: index.ajouter(noeud)
+        invalider_empreintes(noeud)
+
+# --- Liens vers le père ---
+def lier_peres(racine):
+    """
+    (Re)calcule les liens pere/rang de tout l'arbre (pile explicite, O(n)) et
+    oublie les tables de noms, reconstruites à la prochaine résolution de chemin.
+    """
+    if racine is None: return
+    racine.pere, racine.rang = None, -1
+    c = compteurs
+    pile = [racine]
+    while pile:
+        if c is not None: c.visiter(len(pile))
+        n = pile.pop()
+        n.noms = None
+        for i, f in fils_naires(n):
+            f.pere, f.rang = n, i
+            pile.append(f)
+
+def lien_valide(noeud):
+    """Vrai si le lien pere/rang du noeud est renseigné et cohérent avec le père."""
+    p = noeud.pere
+    return p is not None and 0 <= noeud.rang < len(p.fils) and p.fils[noeud.rang] is noeud
+
+def chemin_vers_racine(noeud):
+    """
+    Retourne la liste des noeuds de 'noeud' jusqu'à la racine en O(profondeur).
+    La remontée s'arrête au premier lien absent ou incohérent.
+    """
+    res = []
+    while noeud is not None:
+        res.append(noeud)
+        noeud = noeud.pere if lien_valide(noeud) else None
+    return res
+
+def remonter_jusqua(b, a):
+    """
+    Remonte de 'b' vers son ancêtre 'a' via les liens pere.
+    Retourne la liste [b, ..., a] ou None si 'a' n'est pas rencontré.
+    """
+    res = []
+    n = b
+    while n is not None:
+        res.append(n)
+        if n is a: return res
+        n = n.pere if lien_valide(n) else None
+    return None
+
+def detacher(noeud):
+    """
+    Coupe en O(1) le lien entre un noeud et son père (lien pere/rang valide requis).
+    Retourne (pere, rang) ou (None, -1) si le lien n'est pas disponible.
+    """
+    if not lien_valide(noeud): return None, -1
+    p, k = noeud.pere, noeud.rang
+    couper(p, k)
+    return p, k
+
+def couper(pere, rang):
+    """
+    Vide la case 'rang' de 'pere' et fait du fils qui l'occupait une racine
+    (tables de noms et caches à jour). Utilisé quand le lien pere du fils
+    n'est pas suivi : le père a été trouvé autrement (parcours, étiquetage).
+    """
+    noeud = pere.fils[rang]
+    pere.fils[rang] = None
+    _noms_retirer(pere, rang, noeud.info)
+    noeud.pere, noeud.rang = None, -1
+    signaler_modification(pere)
+
+def signaler_modification(pere):
+    """
+    Point d'entrée commun des modifications de structure : à appeler dès que
+    les fils de 'pere' changent (inserer, adopter_fils, supprimer, extraire).
+    Invalide les agrégats et empreintes en cache de 'pere' et de ses ancêtres,
+    et périme les index globaux (IndexLCA, EtiquetageIntervalle) dont l'arbre
+    contient 'pere' : un test O(1) par index vivant, les autres restent valides.
+    """
+    if _index_a_l_ecoute:
+        for idx in list(_index_a_l_ecoute): idx.signaler(pere)
+    invalider_agregats(pere)
+    invalider_empreintes(pere)
+
+# --- Adressage par chemin (tables nom -> case) ---
+# Chaque noeud peut porter une table 'noms' (info d'un fils -> rangs des fils
+# portant ce nom, triés), construite au premier passage d'une résolution de
+# chemin puis tenue à jour par inserer, modifier, supprimer, extraire (detacher),
+# adopter_fils et la construction en masse. Un chemin "C:/Users/Admin" se
+# résout alors en O(longueur du chemin) au lieu d'une recherche globale.
+# Après une écriture directe dans 'fils', lier_peres() oublie les tables ; une
+# table périmée est de toute façon détectée et reconstruite à la lecture.
+
+def noms_fils(noeud):
+    """Table nom -> rangs des fils de 'noeud', construite en O(arité) si absente."""
+    t = noeud.noms
+    if t is None:
+        t = noeud.noms = {}
+        for k, f in fils_naires(noeud):
+            t.setdefault(f.info, []).append(k)
+    return t
+
+def _noms_ajouter(pere, f):
+    """Enregistre le fils 'f' (lien rang renseigné) dans la table de 'pere', si elle existe."""
+    t = pere.noms
+    if t is None: return
+    rangs = t.get(f.info)
+    if rangs is None: t[f.info] = [f.rang]
+    elif f.rang not in rangs:
+        rangs.append(f.rang)
+        rangs.sort()
+
+def _noms_retirer(pere, rang, info):
+    """Retire la case 'rang' (fils nommé 'info') de la table de 'pere' ; sans effet si absente."""
+    t = pere.noms
+    if t is None: return
+    rangs = t.get(info)
+    if rangs and rang in rangs:
+        rangs.remove(rang)
+        if not rangs: del t[info]
+
+def fils_nommes(noeud, nom):
+    """Liste des fils de 'noeud' portant l'info 'nom' (ordre des cases), en O(1) amorti."""
+    rangs = noms_fils(noeud).get(nom, ())
+    fils = noeud.fils
+    res = [fils[k] for k in rangs]
+    if any(f is None or f.info != nom for f in res):
+        # Table périmée (écriture directe dans les fils) : reconstruction
+        noeud.noms = None
+        res = [fils[k] for k in noms_fils(noeud).get(nom, ())]
+    return res
+
+def fils_par_nom(noeud, nom):
+    """Premier fils de 'noeud' portant l'info 'nom', ou None."""
+    res = fils_nommes(noeud, nom)
+    return res[0] if res else None
+
+def _composants(chemin, separateur="/"):
+    """Découpe un chemin (chaîne ou séquence de noms) en composants non vides."""
+    noms = chemin.split(separateur) if isinstance(chemin, str) else list(chemin)
+    return [c for c in noms if c != ""]
+
+def resoudre_chemin(racine, chemin, separateur="/"):
+    """
+    Retourne le noeud désigné par 'chemin' (ex. "C:/Users/Admin/Docs"), qui part
+    de la racine, ou None. Chaque composant est résolu par la table de noms du
+    noeud courant : O(longueur du chemin), quelle que soit la taille de l'arbre.
+    Si plusieurs frères portent le même nom, le premier (plus petite case) est suivi.
+    """
+    noms = _composants(chemin, separateur)
+    if racine is None: return None
+    if not noms: return racine
+    if racine.info != noms[0]: return None
+    c = compteurs
+    n = racine
+    for nom in noms[1:]:
+        if c is not None: c.visiter(1)
+        n = fils_par_nom(n, nom)
+        if n is None: return None
+    return n
+
+def chemin_complet(noeud, separateur="/"):
+    """Chemin "racine/.../noeud" d'un noeud, en O(profondeur) via les liens pere."""
+    return separateur.join(str(n.info) for n in reversed(chemin_vers_racine(noeud)))
+
+def _est_motif(composant):
+    return any(ch in composant for ch in "*?[")
+
+def rechercher_chemins(racine, motif, separateur="/"):
+    """
+    Générateur des noeuds dont le chemin correspond à 'motif', composant par
+    composant (syntaxe fnmatch : *, ?, [abc]) ; "**" couvre zéro, un ou
+    plusieurs niveaux. Les composants littéraux passent par les tables de noms,
+    seuls les composants génériques parcourent les fils. Ex. "C:/Users/*/Docs".
+    """
+    noms = _composants(motif, separateur)
+    if racine is None: return
+    if not noms:
+        yield racine
+        return
+    dernier = len(noms) - 1
+    # Composants finaux tous "**" (à partir de 'fin_etoiles') : ils peuvent ne
+    # couvrir aucun niveau, le noeud qui précède correspond alors au motif
+    fin_etoiles = len(noms)
+    while fin_etoiles and noms[fin_etoiles - 1] == "**": fin_etoiles -= 1
+    c = compteurs
+    vus, rendus = set(), set()
+    # (noeud, i) : le noeud doit correspondre au composant i
+    pile = [(racine, 0)]
+    while pile:
+        if c is not None: c.visiter(len(pile))
+        n, i = pile.pop()
+        if (id(n), i) in vus: continue
+        vus.add((id(n), i))
+        comp = noms[i]
+        if comp == "**":
+            # Un niveau de plus absorbé par "**", ou aucun
+            pile.extend((f, i) for _, f in reversed(fils_naires(n)))
+            if i == dernier:
+                if id(n) not in rendus:
+                    rendus.add(id(n))
+                    yield n
+            else: pile.append((n, i + 1))
+            continue
+        if _est_motif(comp):
+            if not fnmatch.fnmatchcase(str(n.info), comp): continue
+        elif n.info != comp: continue
+        if i + 1 >= fin_etoiles and id(n) not in rendus:
+            rendus.add(id(n))
+            yield n
+        if i == dernier: continue
+        suivant = noms[i + 1]
+        if suivant == "**" or _est_motif(suivant):
+            pile.extend((f, i + 1) for _, f in reversed(fils_naires(n)))
+        else:
+            pile.extend((f, i + 1) for f in reversed(fils_nommes(n, suivant)))
+
+def completer_chemin(racine, debut, separateur="/"):
+    """
+    Requête par préfixe : les noeuds dont le chemin commence par 'debut'
+    ("C:/Users/Ad" -> Admin ; "C:/Users/" -> tous les fils de Users).
+    Le dossier parent est résolu en O(longueur), puis ses fils sont filtrés.
+    """
+    if racine is None: return []
+    noms = _composants(debut, separateur)
+    # Séparateur final : préfixe vide, tous les fils du dernier dossier
+    if isinstance(debut, str) and noms and debut.endswith(separateur): noms.append("")
+    if not noms: return [racine]
+    if len(noms) == 1:
+        return [racine] if str(racine.info).startswith(noms[0]) else []
+    pere = resoudre_chemin(racine, noms[:-1], separateur)
+    if pere is None: return []
+    return [f for _, f in fils_naires(pere) if str(f.info).startswith(noms[-1])]
 
 # --- Utilitaires pour la suppression ---
 def rechercher_pere_idx(racine, cible):
     """Retourne le père d'un noeud cible et l'index du cible dans le tableau des fils."""
     if not racine or racine == cible: return None, -1
-    for i, f in enumerate(racine.fils):
-        if f == cible: return racine, i
-        if f:
-            p, k = rechercher_pere_idx(f, cible)
-            if p: return p, k
-    return None, -1
+    res = [None, -1]
+    def visiter(n, pere, rang, prof):
+        if n == cible:
+            res[0], res[1] = pere, rang
+            return ARRET
+    parcours_profondeur(racine, visiter)
+    return res[0], res[1]
 
 def adopter_fils(nouveau_pere, anciens_fils):
     """Transfère les orphelins vers un nouveau père (Promotion)."""
-    idx_start = 0
-    # Chercher la première place libre chez le nouveau père
-    while idx_start < N and nouveau_pere.fils[idx_start] is not None:
-        idx_start += 1
-    # Ajouter les anciens fils
+    fils = nouveau_pere.fils
     for orphelin in anciens_fils:
-        if orphelin is not None and idx_start < N:
-            nouveau_pere.fils[idx_start] = orphelin
-            idx_start += 1
+        if orphelin is None: continue
+        # Première place libre chez le nouveau père (les cases occupées sont conservées)
+        k = premier_libre(fils)
+        if k < 0: break
+        fils[k] = orphelin
+        orphelin.pere, orphelin.rang = nouveau_pere, k
+        _noms_ajouter(nouveau_pere, orphelin)
+    signaler_modification(nouveau_pere)
 
-def supprimer(racine, val):
+def supprimer(racine, val, index=None):
     """
     Supprime le noeud contenant 'val'.
     Gère la promotion : si le noeud a des enfants, le 1er fils remplace le père
     et adopte ses frères.
     """
-    cible = rechercher(racine, val)
+    cible = rechercher(racine, val, index)
     if not cible: return racine
         
     # Cas 1 : Suppression de la racine
     if cible == racine:
+        if index is not None: index.vider()
         return None # Simplification: on vide l'arbre
         
     # Cas 2 : Noeud interne ou feuille
-    p, k = rechercher_pere_idx(racine, cible)
-    if p:
+    # Lien vers le père en O(1) s'il est suivi, sinon nouveau parcours de l'arbre
+    p, k = detacher(cible)
+    if not p:
+        p, k = rechercher_pere_idx(racine, cible)
         # En Python, supprimer la référence suffit pour que le Garbage Collector agisse.
         # Note: Une implémentation plus complexe ferait ici la promotion des fils.
-        p.fils[k] = None 
+        if p: couper(p, k)
+    if p:
+        # Le sous-arbre détaché ne fait plus partie de l'arbre indexé
+        if index is not None: index.desindexer_sous_arbre(cible)
     
     return racine
 
@@ -277,170 +1297,2537 @@ def est_complet(racine):
     Utilise un parcours en largeur. Si on trouve un noeud après avoir vu une case vide,
     l'arbre n'est pas complet.
     """
-    if not racine: return True
-    queue = [racine]
     seen_none = False # Drapeau : a-t-on rencontré un vide ?
-    
-    while queue:
-        curr = queue.pop(0)
-        if curr is None:
-            seen_none = True
-        else:
-            # Si on voit un noeud APRES un vide, ce n'est pas complet
-            if seen_none: return False
-            for f in curr.fils: queue.append(f)
+    for curr in iter_bfs(racine):
+        fils = curr.fils
+        if type(fils) is not list:
+            # Tableau creux : les cases occupées doivent former un préfixe
+            occ = fils.occupation
+            if occ and (seen_none or occ & (occ + 1)): return False
+            if occ != (1 << fils.arite) - 1: seen_none = True
+            continue
+        for f in fils:
+            if f is None:
+                seen_none = True
+            elif seen_none:
+                # Si on voit un noeud APRES un vide, ce n'est pas complet
+                return False
     return True
 
 def nb_noeuds(r):
-    """Compte le nombre total de noeuds (récursif)."""
-    if not r: return 0
-    return 1 + sum(nb_noeuds(f) for f in r.fils)
+    """Compte le nombre total de noeuds (parcours en profondeur)."""
+    compte = [0]
+    def visiter(n, pere, rang, prof):
+        compte[0] += 1
+    parcours_profondeur(r, visiter)
+    return compte[0]
 
-def sous_arbre_complet_max(racine):
+def sous_arbre_complet_max_naif(racine):
     """
     Cherche le plus grand sous-arbre complet inclus dans l'arbre.
     Algorithme naïf en O(N^2) : teste 'est_complet' pour chaque noeud.
+    Conservé comme référence (oracle) pour valider sous_arbre_complet_max.
+    """
+    best = [0, None]
+    def visiter(n, pere, rang, prof):
+        # Si le noeud forme un arbre complet, c'est potentiellement le max :
+        # inutile de descendre, ses sous-arbres sont plus petits.
+        if est_complet(n):
+            taille = nb_noeuds(n)
+            if taille > best[0]: best[0], best[1] = taille, n
+            return ELAGUER
+        # Sinon, on cherche le max chez les fils (premier meilleur en ordre préfixe)
+    parcours_profondeur(racine, visiter)
+    return best[0], best[1]
+
+# Résumé d'un sous-arbre : (hauteur, parfait, complet, taille). Case vide :
+RESUME_VIDE = (0, True, True, 0)
+
+def combiner_resumes(resumes_fils):
+    """
+    Calcule le résumé d'un noeud à partir des résumés de ses cases (O(arité)).
+    - parfait : tous les niveaux sont pleins.
+    - complet : au sens de est_complet (rempli niveau par niveau, de gauche à droite).
+    Un noeud de hauteur h est complet si ses fils sont, dans l'ordre : des
+    sous-arbres parfaits de hauteur h-1, puis au plus un sous-arbre complet de
+    hauteur h-1 (ou parfait de hauteur h-2), puis des parfaits de hauteur h-2.
+    """
+    h = 1 + max(r[0] for r in resumes_fils)
+    taille = 1 + sum(r[3] for r in resumes_fils)
+    i, k = 0, len(resumes_fils)
+    while i < k and resumes_fils[i][1] and resumes_fils[i][0] == h - 1:
+        i += 1
+    if i == k: return h, True, True, taille
+    r = resumes_fils[i]
+    complet = (r[2] and r[0] == h - 1) or (r[1] and r[0] == h - 2)
+    complet = complet and all(x[1] and x[0] == h - 2 for x in resumes_fils[i + 1:])
+    return h, False, complet, taille
+
+def resumes_cases(noeud, resume_de):
+    """
+    Résumés des cases de 'noeud' à passer à combiner_resumes (RESUME_VIDE pour
+    une case vide, resume_de(f) sinon). Pour un tableau creux, chaque suite de
+    cases vides est réduite à deux cases au plus : le résultat de combiner_resumes
+    est inchangé et le coût ne dépend que du nombre de fils présents.
+    """
+    fils = noeud.fils
+    if type(fils) is list:
+        return [RESUME_VIDE if f is None else resume_de(f) for f in fils]
+    res, prec = [], -1
+    for k, f in fils.occupes():
+        res.extend([RESUME_VIDE] * min(k - prec - 1, 2))
+        res.append(resume_de(f))
+        prec = k
+    res.extend([RESUME_VIDE] * min(len(fils) - prec - 1, 2))
+    return res
+
+def sous_arbre_complet_max(racine):
+    """
+    Cherche le plus grand sous-arbre complet inclus dans l'arbre.
+    Une seule passe ascendante (post-ordre, pile explicite) en O(n) : le résumé
+    de chaque noeud est combiné à partir de ceux de ses fils.
+    Même résultat (taille, noeud) que sous_arbre_complet_max_naif : un noeud
+    complet est retenu tel quel, sinon on garde le premier meilleur de ses fils.
     """
     if not racine: return 0, None
-    # Si la racine actuelle forme un arbre complet, c'est potentiellement le max
-    if est_complet(racine):
-        return nb_noeuds(racine), racine
-    
-    # Sinon, on cherche récursivement le max chez les fils
-    best_n, best_node = 0, None
-    for f in racine.fils:
-        n, node = sous_arbre_complet_max(f)
-        if n > best_n:
-            best_n, best_node = n, node
+    pile = [(racine, False)]
+    valeurs = [] # (resume, best_n, best_node) des sous-arbres déjà traités
+    c = compteurs
+    while pile:
+        noeud, sortie = pile.pop()
+        if not sortie:
+            if c is not None: c.visiter(len(pile) + 1)
+            pile.append((noeud, True))
+            pile.extend((f, False) for _, f in reversed(fils_naires(noeud)))
+            continue
+        # Les résultats des fils sont au sommet de la pile, dans l'ordre des cases
+        presents = fils_naires(noeud)
+        enfants = valeurs[len(valeurs) - len(presents):]
+        del valeurs[len(valeurs) - len(presents):]
+        par_fils = {id(f): v for (_, f), v in zip(presents, enfants)}
+        best_n, best_node = 0, None
+        for _, n, node in enfants:
+            if n > best_n: best_n, best_node = n, node
+        res = combiner_resumes(resumes_cases(noeud, lambda f: par_fils[id(f)][0]))
+        if res[2]: best_n, best_node = res[3], noeud
+        valeurs.append((res, best_n, best_node))
+    _, best_n, best_node = valeurs[0]
+    return best_n, best_node
+
+# --- Agrégats maintenus incrémentalement ---
+# noeud.agregat = (resume, best_n, best_node) où resume = (hauteur, parfait,
+# complet, taille) comme dans combiner_resumes, et (best_n, best_node) le
+# résultat de sous_arbre_complet_max pour le sous-arbre du noeud.
+# Invariant : si un noeud n'a pas d'agrégat, ses ancêtres non plus. Après une
+# modification, seuls les agrégats du chemin vers la racine sont recalculés.
+
+def invalider_agregats(noeud):
+    """Efface les agrégats de 'noeud' et de ses ancêtres (liens pere requis), en O(profondeur)."""
+    while noeud is not None and noeud.agregat is not None:
+        noeud.agregat = None
+        noeud = noeud.pere if lien_valide(noeud) else None
+
+def agregats(racine):
+    """
+    Retourne l'agrégat du sous-arbre de 'racine', en ne recalculant que les
+    noeuds invalidés (post-ordre, pile explicite ; les sous-arbres à jour sont sautés).
+    Premier appel : O(n). Après une modification isolée : O(profondeur * fils présents).
+    """
+    if racine is None: return RESUME_VIDE, 0, None
+    c = compteurs
+    pile = [(racine, False)]
+    while pile:
+        noeud, sortie = pile.pop()
+        if not sortie:
+            if noeud.agregat is not None: continue
+            if c is not None: c.visiter(len(pile) + 1)
+            pile.append((noeud, True))
+            pile.extend((f, False) for _, f in fils_naires(noeud) if f.agregat is None)
+            continue
+        best_n, best_node = 0, None
+        for _, f in fils_naires(noeud):
+            _, n, node = f.agregat
+            if n > best_n: best_n, best_node = n, node
+        res = combiner_resumes(resumes_cases(noeud, lambda f: f.agregat[0]))
+        if res[2]: best_n, best_node = res[3], noeud
+        noeud.agregat = (res, best_n, best_node)
+    return racine.agregat
+
+def hauteur_cache(r):
+    """hauteur(r) à partir des agrégats en cache."""
+    return agregats(r)[0][0]
+
+def nb_noeuds_cache(r):
+    """nb_noeuds(r) à partir des agrégats en cache."""
+    return agregats(r)[0][3]
+
+def est_complet_cache(r):
+    """est_complet(r) à partir des agrégats en cache."""
+    return agregats(r)[0][2]
+
+def sous_arbre_complet_max_cache(r):
+    """sous_arbre_complet_max(r) à partir des agrégats en cache."""
+    _, best_n, best_node = agregats(r)
     return best_n, best_node
 
-def extraire(racine, val):
+def verifier_agregats(racine):
+    """
+    Contrôle de cohérence : compare l'agrégat en cache de chaque noeud aux
+    fonctions recalculées de zéro (hauteur, nb_noeuds, est_complet,
+    sous_arbre_complet_max_naif). Retourne la liste des noeuds incohérents.
+    Coûteux (O(n^2)) : réservé aux tests et au débogage.
+    """
+    incoherents = []
+    for n in iter_dfs_pre(racine):
+        if n.agregat is None: continue
+        (h, _, complet, taille), best_n, best_node = n.agregat
+        attendu = (hauteur(n), est_complet(n), nb_noeuds(n), sous_arbre_complet_max_naif(n))
+        if (h, complet, taille, (best_n, best_node)) != attendu:
+            incoherents.append(n)
+    return incoherents
+
+def _appartient(racine, noeud, etiquettes=None):
+    """
+    Vrai si 'noeud' est dans l'arbre 'racine' : lecture de l'étiquetage s'il est
+    fourni, sinon remontée des liens pere, sinon (liens absents) parcours.
+    """
+    if noeud is racine: return True
+    if etiquettes is not None: return etiquettes.contient(noeud)
+    if chemin_vers_racine(noeud)[-1] is racine: return True
+    return rechercher_pere_idx(racine, noeud)[0] is not None
+
+def extraire(racine, val=None, index=None, etiquettes=None, noeud=None, rang=None):
     """
     Extrait un sous-arbre (coupe le lien avec son père) et le retourne.
-    Retourne (NouvelleRacinePrincipale, SousArbreExtrait).
+    Retourne (NouvelleRacinePrincipale, SousArbreExtrait), le second valant None
+    si la cible est introuvable. La cible est donnée par un seul paramètre :
+    - val   : info cherchée (via 'index' s'il est fourni) ;
+    - noeud : le noeud lui-même, qui doit appartenir à 'racine' (ValueError sinon) ;
+    - rang  : numéro d'entrée (rang préfixe) dans 'etiquettes', résolu en O(1).
+    Avec un EtiquetageIntervalle de 'racine', le père d'une cible sans lien pere
+    est lu dans l'étiquetage au lieu d'un parcours.
     """
-    cible = rechercher(racine, val)
+    if (val is not None) + (noeud is not None) + (rang is not None) != 1:
+        raise ValueError("Une seule cible attendue : val, noeud ou rang")
+    if etiquettes is not None and etiquettes.racine is not racine: etiquettes = None
+    if rang is not None:
+        if etiquettes is None: raise ValueError("'rang' requiert un EtiquetageIntervalle de 'racine'")
+        if not 0 <= rang < etiquettes.taille(racine): return racine, None
+        cible = etiquettes.kieme(rang)
+    elif noeud is not None:
+        if not _appartient(racine, noeud, etiquettes):
+            raise ValueError(f"Le noeud '{noeud.info}' n'appartient pas à l'arbre")
+        cible = noeud
+    else: cible = rechercher(racine, val, index)
     if not cible: return racine, None
     
     # Si on extrait la racine, l'arbre principal devient vide
-    if cible == racine: return None, cible
+    if cible is racine:
+        if index is not None: index.vider()
+        return None, cible
     
-    p, k = rechercher_pere_idx(racine, cible)
+    if etiquettes is not None and not lien_valide(cible) and etiquettes.contient(cible):
+        p = etiquettes.pere(cible)
+        k = next(i for i, f in fils_naires(p) if f is cible)
+        couper(p, k) # Coupe le lien : le sous-arbre extrait devient une racine
+    else:
+        p, k = detacher(cible)
+        if not p:
+            p, k = rechercher_pere_idx(racine, cible)
+            if p: couper(p, k)
     if p:
-        p.fils[k] = None # Coupe le lien
+        if index is not None: index.desindexer_sous_arbre(cible)
         return racine, cible
     return racine, None
 
+def greffer(pere, sous_arbre, rang=None, index=None):
+    """
+    Opération inverse de extraire : attache la racine détachée 'sous_arbre'
+    sous 'pere', dans la case 'rang' (la première case libre par défaut).
+    Retourne False si la case est occupée ou si 'pere' est plein.
+    """
+    fils = pere.fils
+    k = premier_libre(fils) if rang is None else rang
+    if k < 0 or fils[k] is not None: return False
+    fils[k] = sous_arbre
+    sous_arbre.pere, sous_arbre.rang = pere, k
+    _noms_ajouter(pere, sous_arbre)
+    if index is not None: index.indexer_sous_arbre(sous_arbre)
+    signaler_modification(pere)
+    return True
+
+# --- Suppression / extraction en masse ---
+
+def _detacher_lot(racine, valeurs, index):
+    """
+    Détache en un seul parcours préfixe tous les noeuds dont l'info est dans
+    'valeurs' (les sous-arbres d'un noeud détaché ne sont pas visités).
+    Retourne (nouvelle_racine, liste des sous-arbres détachés dans l'ordre préfixe).
+    """
+    cibles = set(valeurs)
+    if racine is None or not cibles: return racine, []
+    if racine.info in cibles:
+        if index is not None: index.vider()
+        return None, [racine]
+    detaches = []
+    def visiter(n, pere, rang, prof):
+        if n.info not in cibles: return None
+        pere.fils[rang] = None
+        _noms_retirer(pere, rang, n.info)
+        n.pere, n.rang = None, -1
+        signaler_modification(pere)
+        if index is not None: index.desindexer_sous_arbre(n)
+        detaches.append(n)
+        return ELAGUER
+    parcours_profondeur(racine, visiter)
+    return racine, detaches
+
+def supprimer_lot(racine, valeurs, index=None):
+    """
+    Supprime en un seul parcours tous les noeuds (et leurs sous-arbres) dont
+    l'info figure dans 'valeurs'. Retourne la racine (None si elle est visée).
+    """
+    return _detacher_lot(racine, valeurs, index)[0]
+
+def extraire_lot(racine, valeurs, index=None):
+    """
+    Extrait en un seul parcours tous les sous-arbres dont la racine porte une
+    info de 'valeurs'. Retourne (NouvelleRacinePrincipale, [SousArbresExtraits]).
+    """
+    return _detacher_lot(racine, valeurs, index)
+
 def transfo_binaire(racine):
     """
     Transforme l'arbre N-aire en arbre binaire.
-    Règle : Fils Gauche = Premier Fils N-aire
+    Règle : Fils Gauche = Premier Fils N-aire (première case occupée)
             Fils Droit  = Frère Suivant (Prochain fils du même père)
+    Pile explicite de couples (noeud, copie binaire) : les copies des fils d'un
+    noeud sont créées ensemble et chaînées par 'droit' au moment où il est
+    dépilé. Fonctionne aussi sur un arbre partagé (canoniser), chaque
+    occurrence d'un sous-arbre recevant sa propre copie.
     """
     if not racine: return None
-    b = NoeudBinaire(racine.info)
-    
-    # Le premier fils n-aire devient le fils gauche binaire
-    b.gauche = transfo_binaire(racine.fils[0])
-    
-    # Les autres fils n-aires deviennent une chaîne de frères à droite
-    if b.gauche:
-        curr = b.gauche
-        for i in range(1, N):
-            # Chaque frère est attaché au 'droit' du précédent
-            curr.droit = transfo_binaire(racine.fils[i])
-            if curr.droit: curr = curr.droit
-    return b
+    c = compteurs
+    racine_b = NoeudBinaire(racine.info)
+    pile = [(racine, racine_b)]
+    while pile:
+        if c is not None: c.visiter(len(pile))
+        n, b = pile.pop()
+        prec = None
+        for _, f in fils_naires(n):
+            bf = NoeudBinaire(f.info)
+            if prec is None:
+                b.gauche = bf # Le premier fils devient le fils gauche
+            else:
+                prec.droit = bf # Chaque frère est attaché au 'droit' du précédent
+            prec = bf
+            pile.append((f, bf))
+    return racine_b
 
 def afficher_binaire(b, prefix="", is_left=True):
-    """Affiche l'arbre binaire transformé."""
-    if b:
-        print(prefix + ("|-- " if is_left else "L-- ") + str(b.info))
-        afficher_binaire(b.gauche, prefix + ("|   " if is_left else "    "), True)
-        afficher_binaire(b.droit, prefix + ("|   " if is_left else "    "), False)
+    """Affiche l'arbre binaire transformé (gauche au rang 0, droit au rang 1)."""
+    ecrire_binaire(b, sys.stdout, prefix=prefix, is_left=is_left)
 
-# ==========================================
-# 4. EVALUATION EXPERIMENTALE
-# ==========================================
+# --- Vue binaire paresseuse et transformation inverse ---
 
-def mesurer_temps(fonction, *args):
+class VueBinaire:
     """
-    Mesure le temps d'exécution d'une fonction.
-    Utilise contextlib pour supprimer les print() durant la mesure afin de ne mesurer
-    que le temps de calcul pur, pas le temps d'affichage console.
+    Vue binaire (fils gauche / frère droit) d'un arbre N-aire, sans copie :
+    'gauche' et 'droit' sont calculés à chaque accès à partir de noeud.fils.
+    - noeud : Noeud N-aire représenté.
+    - pere, rang : père et case du noeud dans la vue (None, -1 pour la racine) ;
+      ils ne dépendent pas des liens pere du Noeud (vue valable sur un arbre partagé).
+    S'utilise partout où un NoeudBinaire est lu (ecrire_binaire, fils_binaires...).
+    Les vues sont créées à la demande : deux accès donnent deux objets distincts.
     """
-    start = time.perf_counter()
-    # Redirection de la sortie standard vers une boite noire (IO)
-    with contextlib.redirect_stdout(io.StringIO()):
-        fonction(*args)
-    end = time.perf_counter()
-    return end - start
+    __slots__ = ("noeud", "pere", "rang")
 
-def lancer_evaluation():
+    def __init__(self, noeud, pere=None, rang=-1):
+        self.noeud = noeud
+        self.pere = pere
+        self.rang = rang
+
+    @property
+    def info(self):
+        return self.noeud.info
+
+    @property
+    def gauche(self):
+        """Premier fils N-aire (première case occupée)."""
+        suivant = fils_suivant(self.noeud.fils, -1)
+        return VueBinaire(suivant[1], self.noeud, suivant[0]) if suivant else None
+
+    @property
+    def droit(self):
+        """Frère suivant (case occupée suivante chez le père)."""
+        if self.pere is None: return None
+        suivant = fils_suivant(self.pere.fils, self.rang)
+        return VueBinaire(suivant[1], self.pere, suivant[0]) if suivant else None
+
+def vue_binaire(racine):
+    """Vue binaire paresseuse de l'arbre (None pour un arbre vide)."""
+    return VueBinaire(racine) if racine is not None else None
+
+def materialiser_binaire(b):
     """
-    Lance la batterie de tests sur des tailles croissantes (10 à 1000).
-    Affiche un tableau comparatif des temps d'exécution.
+    Copie réelle (NoeudBinaire) d'un arbre binaire quelconque (VueBinaire ou
+    NoeudBinaire), pile explicite : chaque noeud lu est aussitôt recopié, la
+    source n'est parcourue qu'une fois et jamais matérialisée en entier.
     """
-    tailles = [10, 20, 30, 40, 50, 100, 200, 500, 1000]
-    
-    print("\n" + "="*155)
-    print(f"{'EVALUATION COMPLETE (Temps en secondes)':^155}")
-    print("="*155)
-    
-    # En-têtes du tableau
-    headers = ["N", "Const", "Affich", "Haut", "Rech", "Chem", "Inser", "Modif", "Suppr", "SsArb", "Compl", "MaxSA", "Extr", "Trans"]
-    print(f"{headers[0]:<5} | {headers[1]:<8} | {headers[2]:<8} | {headers[3]:<8} | {headers[4]:<8} | {headers[5]:<8} | {headers[6]:<8} | {headers[7]:<8} | {headers[8]:<8} | {headers[9]:<8} | {headers[10]:<8} | {headers[11]:<8} | {headers[12]:<8} | {headers[13]:<8}")
-    print("-" * 155)
-    
-    for n in tailles:
-        # --- 1. Construction ---
-        t_const = mesurer_temps(const_arbre_aleatoire, n)
-        
-        # Création d'un arbre de travail pour les autres tests
-        arbre = const_arbre_aleatoire(n) 
-        noeud_exist = rechercher(arbre, "N1") 
-        if not noeud_exist: noeud_exist = arbre 
-        val_absent = "INEXISTANT" # Pour forcer le pire cas de recherche
-        
-        # --- 2. Lectures (Parcours, Hauteur, etc.) ---
-        t_aff = mesurer_temps(afficher_parcours, arbre)
-        t_haut = mesurer_temps(hauteur, arbre)
-        t_rech = mesurer_temps(rechercher, arbre, val_absent) # Pire cas
-        t_chem = mesurer_temps(chemin, arbre, noeud_exist)
-        t_compl = mesurer_temps(est_complet, arbre)
-        t_ssarb = mesurer_temps(afficher_sous_arbre, arbre, noeud_exist)
-        
-        # --- 3. Ecritures (Modifications) ---
-        t_ins = mesurer_temps(inserer, noeud_exist, "TEST")
-        t_mod = mesurer_temps(modifier, noeud_exist, "MOD")
-        
-        # --- 4. Opérations destructives (sur des copies) ---
-        arb_tmp_supp = const_arbre_aleatoire(n)
-        t_supp = mesurer_temps(supprimer, arb_tmp_supp, "N5")
-        
-        arb_tmp_extr = const_arbre_aleatoire(n)
-        t_extr = mesurer_temps(extraire, arb_tmp_extr, "N_Milieu")
-        
-        # --- 5. Opérations Complexes ---
-        t_max = mesurer_temps(sous_arbre_complet_max, arbre)
-        t_trans = mesurer_temps(transfo_binaire, arbre)
-        
-        # Affichage de la ligne de résultats
-        print(f"{n:<5} | {t_const:.6f} | {t_aff:.6f} | {t_haut:.6f} | {t_rech:.6f} | {t_chem:.6f} | {t_ins:.6f} | {t_mod:.6f} | {t_supp:.6f} | {t_ssarb:.6f} | {t_compl:.6f} | {t_max:.6f} | {t_extr:.6f} | {t_trans:.6f}")
-    
-    print("-" * 155)
-    input("Appuyez sur Entrée pour revenir au menu...")
+    if b is None: return None
+    c = compteurs
+    racine = NoeudBinaire(b.info)
+    pile = [(b, racine)]
+    while pile:
+        if c is not None: c.visiter(len(pile))
+        src, copie = pile.pop()
+        g, d = src.gauche, src.droit
+        if d is not None:
+            copie.droit = NoeudBinaire(d.info)
+            pile.append((d, copie.droit))
+        if g is not None:
+            copie.gauche = NoeudBinaire(g.info)
+            pile.append((g, copie.gauche))
+    return racine
 
-# ==========================================
-# 5. MENU PRINCIPAL
-# ==========================================
+def binaire_vers_naire(b, arite=N):
+    """
+    Transformation inverse de transfo_binaire (pile explicite) : les fils d'un
+    noeud sont sa chaîne gauche -> droit -> droit..., rangés à gauche dans les
+    cases 0, 1, ... d'un Noeud d'arité 'arite' (liens pere/rang renseignés).
+    ValueError si un noeud a plus de 'arite' fils ou si la racine a un frère
+    droit (l'arbre binaire coderait alors une forêt).
+    """
+    if b is None: return None
+    if b.droit is not None:
+        raise ValueError("La racine binaire a un frère droit : ce n'est pas un arbre N-aire")
+    c = compteurs
+    racine = Noeud(b.info, arite)
+    pile = [(b, racine)]
+    while pile:
+        if c is not None: c.visiter(len(pile))
+        src, n = pile.pop()
+        k, f = 0, src.gauche
+        while f is not None:
+            if k == arite:
+                raise ValueError(f"Le noeud '{n.info}' a plus de {arite} fils")
+            copie = n.fils[k] = Noeud(f.info, arite)
+            copie.pere, copie.rang = n, k
+            pile.append((f, copie))
+            k += 1
+            f = f.droit
+    return racine
 
-def pause():
-    input("\n[Entrée pour continuer...]")
+# --- Empreintes structurelles et partage de sous-arbres ---
+# noeud.empreinte = condensé BLAKE2b (16 octets) de (info, arité, (rang,
+# empreinte) de chaque fils présent) : deux sous-arbres ont la même empreinte
+# si et seulement s'ils sont identiques (infos, arité et cases occupées), aux
+# collisions de 128 bits près. Même invariant que les agrégats : un noeud sans
+# empreinte n'a pas d'ancêtre avec empreinte.
+# Un arbre partagé (canoniser) est un graphe sans cycle où un même noeud
+# canonique apparaît sous plusieurs pères : il est en lecture seule (liens
+# pere non renseignés) ; toutes les fonctions de lecture s'y appliquent.
+
+def _empreinte(info, arite, paires):
+    """Condensé d'un noeud à partir de son info, de son arité et des (rang, fils) présents."""
+    donnees = repr(info).encode()
+    h = hashlib.blake2b(len(donnees).to_bytes(4, "little"), digest_size=16)
+    h.update(donnees)
+    h.update(arite.to_bytes(4, "little"))
+    for k, f in paires:
+        h.update(k.to_bytes(4, "little"))
+        h.update(f.empreinte)
+    return h.digest()
+
+def invalider_empreintes(noeud):
+    """Efface les empreintes de 'noeud' et de ses ancêtres (liens pere requis), en O(profondeur)."""
+    while noeud is not None and noeud.empreinte is not None:
+        noeud.empreinte = None
+        noeud = noeud.pere if lien_valide(noeud) else None
+
+def empreintes(racine):
+    """
+    Retourne l'empreinte du sous-arbre de 'racine' en calculant (post-ordre,
+    pile explicite) celles des noeuds qui n'en ont pas : O(n) au premier appel,
+    O(profondeur * fils présents) après une modification isolée, O(1) sur un arbre canonique.
+    """
+    if racine is None: return None
+    c = compteurs
+    pile = [(racine, False)]
+    while pile:
+        noeud, sortie = pile.pop()
+        if not sortie:
+            if noeud.empreinte is not None: continue
+            if c is not None: c.visiter(len(pile) + 1)
+            pile.append((noeud, True))
+            pile.extend((f, False) for _, f in fils_naires(noeud) if f.empreinte is None)
+            continue
+        if noeud.empreinte is None: # Un noeud partagé peut avoir été traité entre-temps
+            noeud.empreinte = _empreinte(noeud.info, len(noeud.fils), fils_naires(noeud))
+    return racine.empreinte
+
+def egalite_structurelle(a, b):
+    """Vrai si les deux sous-arbres sont identiques (comparaison des empreintes en cache)."""
+    if a is b: return True
+    if a is None or b is None: return False
+    return empreintes(a) == empreintes(b)
+
+def canoniser(racine, table=None):
+    """
+    Construit la version partagée (hash-consing) de l'arbre : chaque sous-arbre
+    distinct n'existe qu'en un seul noeud canonique, réutilisé partout où il
+    apparaît. 'table' (clé -> noeud canonique) peut être passée à plusieurs
+    appels pour partager les sous-arbres de toute une forêt. La clé d'un noeud
+    est (info, arité, (rang, id du fils canonique)...) : le partage est exact,
+    sans dépendre des empreintes, qui sont renseignées au passage.
+    L'arbre d'origine n'est pas modifié. Retourne la racine canonique.
+    """
+    if racine is None: return None
+    if table is None: table = {}
+    c = compteurs
+    pile, canons = [(racine, False)], []
+    while pile:
+        noeud, sortie = pile.pop()
+        if not sortie:
+            if c is not None: c.visiter(len(pile) + 1)
+            pile.append((noeud, True))
+            pile.extend((f, False) for _, f in reversed(fils_naires(noeud)))
+            continue
+        # Les fils canoniques sont au sommet de 'canons', dans l'ordre des cases
+        rangs = [k for k, _ in fils_naires(noeud)]
+        paires = list(zip(rangs, canons[len(canons) - len(rangs):]))
+        del canons[len(canons) - len(rangs):]
+        arite = len(noeud.fils)
+        cle = (noeud.info, arite, tuple((k, id(f)) for k, f in paires))
+        canon = table.get(cle)
+        if canon is None:
+            canon = table[cle] = Noeud(noeud.info, arite)
+            for k, f in paires: canon.fils[k] = f
+            canon.empreinte = _empreinte(noeud.info, arite, paires)
+        canons.append(canon)
+    return canons[0]
+
+class CacheAnalyse:
+    """
+    Cache LRU borné des analyses par sous-arbre : (operation, empreinte) -> résultat.
+    Les empreintes ne dépendant que du contenu, une entrée reste valable pour
+    tout sous-arbre identique, dans n'importe quel arbre.
+    """
+    def __init__(self, capacite=4096):
+        self.capacite = capacite
+        self.table = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+
+    def lire(self, cle):
+        """Résultat en cache (None si absent) ; l'entrée devient la plus récente."""
+        valeur = self.table.get(cle)
+        if valeur is None:
+            self.echecs += 1
+            return None
+        self.table.move_to_end(cle)
+        self.succes += 1
+        return valeur
+
+    def ecrire(self, cle, valeur):
+        self.table[cle] = valeur
+        self.table.move_to_end(cle)
+        if len(self.table) > self.capacite:
+            self.table.popitem(last=False) # Évince la moins récemment utilisée
+
+    def vider(self):
+        self.table.clear()
+        self.succes = self.echecs = 0
+
+    def __len__(self):
+        return len(self.table)
+
+CACHE_ANALYSE = CacheAnalyse()
+
+def _analyse_memo(racine, operation, cache, calculer):
+    """
+    Post-ordre mémoïsé : calculer(noeud, valeur_de) produit le résultat d'un noeud
+    à partir de ceux de ses fils (valeur_de(f)). Un sous-arbre déjà rencontré
+    (dans ce parcours ou dans le cache) n'est pas redescendu. Les résultats du
+    parcours sont aussi gardés localement : l'éviction LRU n'affecte pas la justesse.
+    """
+    if cache is None: cache = CACHE_ANALYSE
+    empreintes(racine)
+    c = compteurs
+    valeurs = {} # empreinte -> résultat, pour ce parcours
+    valeur_de = lambda f: valeurs[f.empreinte]
+    pile = [(racine, False)]
+    while pile:
+        noeud, sortie = pile.pop()
+        e = noeud.empreinte
+        if not sortie:
+            if e in valeurs: continue
+            v = cache.lire((operation, e))
+            if v is not None:
+                valeurs[e] = v
+                continue
+            if c is not None: c.visiter(len(pile) + 1)
+            pile.append((noeud, True))
+            pile.extend((f, False) for _, f in fils_naires(noeud))
+            continue
+        if e in valeurs: continue
+        v = valeurs[e] = calculer(noeud, valeur_de)
+        cache.ecrire((operation, e), v)
+    return valeurs[racine.empreinte]
+
+def resume_memo(racine, cache=None):
+    """Résumé (hauteur, parfait, complet, taille) mémoïsé par sous-arbre distinct."""
+    if racine is None: return RESUME_VIDE
+    return _analyse_memo(racine, "resume", cache,
+                         lambda n, valeur_de: combiner_resumes(resumes_cases(n, valeur_de)))
+
+def hauteur_memo(r, cache=None):
+    """hauteur(r) mémoïsée par sous-arbre distinct."""
+    return resume_memo(r, cache)[0]
+
+def nb_noeuds_memo(r, cache=None):
+    """nb_noeuds(r) mémoïsé par sous-arbre distinct."""
+    return resume_memo(r, cache)[3]
+
+def est_complet_memo(r, cache=None):
+    """est_complet(r) mémoïsé par sous-arbre distinct."""
+    return resume_memo(r, cache)[2]
+
+def _chaine_binaire(n, valeur_de):
+    """Copies binaires des fils de 'n' chaînées par 'droit' (le fils gauche de la copie de n)."""
+    premier = prec = None
+    for _, f in fils_naires(n):
+        bf = NoeudBinaire(f.info)
+        bf.gauche = valeur_de(f)[0]
+        if prec is None: premier = bf
+        else: prec.droit = bf
+        prec = bf
+    return (premier,) # 1-uplet : une chaîne vide (None) reste une valeur en cache
+
+def transfo_binaire_memo(racine, cache=None):
+    """
+    transfo_binaire mémoïsée. La copie binaire d'un noeud ne peut pas être
+    partagée (son 'droit' dépend de ses frères), mais son sous-arbre gauche
+    (la chaîne de ses fils et leurs descendants) ne dépend que du sous-arbre
+    N-aire : il est construit une fois par sous-arbre distinct et partagé.
+    Le résultat est donc un arbre binaire partagé, en lecture seule.
+    """
+    if not racine: return None
+    b = NoeudBinaire(racine.info)
+    b.gauche = _analyse_memo(racine, "binaire", cache, _chaine_binaire)[0]
+    return b
+
+def sous_arbres_dupliques(racine, taille_min=2):
+    """
+    Repère les sous-arbres répétés (même empreinte) d'au moins 'taille_min' noeuds.
+    Retourne une liste de (taille, [occurrences]) triée par gain de partage
+    décroissant (taille * (occurrences - 1)). Les sous-arbres internes d'un motif
+    répété sont eux aussi signalés.
+    """
+    if racine is None: return []
+    empreintes(racine)
+    tailles, groupes = {}, {}
+    for n in iter_dfs_post(racine):
+        e = n.empreinte
+        if e not in tailles:
+            tailles[e] = 1 + sum(tailles[f.empreinte] for _, f in fils_naires(n))
+        groupes.setdefault(e, []).append(n)
+    res = [(tailles[e], occ) for e, occ in groupes.items() if len(occ) > 1 and tailles[e] >= taille_min]
+    res.sort(key=lambda x: x[0] * (len(x[1]) - 1), reverse=True)
+    return res
+
+# --- Versions persistantes (copie de chemin) ---
+# Une opération persistante ne modifie aucun noeud existant : elle copie les
+# noeuds du chemin racine -> cible (O(profondeur)) et partage tout le reste avec
+# la version précédente. Les versions partagent donc leurs noeuds et doivent
+# être traitées en lecture seule (les liens pere des noeuds partagés désignent
+# leur père dans la version où ils ont été créés ; ceux des copies sont justes).
+# Les cibles sont désignées par leur suite de rangs depuis la racine.
+
+def _copier_noeud(n):
+    """Copie d'un noeud partageant ses fils (caches vides : la copie va être modifiée)."""
+    copie = Noeud(n.info, len(n.fils))
+    copie.fils = copier_fils(n.fils)
+    return copie
+
+def _copier_chemin(racine, rangs):
+    """Copie les noeuds du chemin racine -> cible (cible comprise) ; retourne la liste des copies."""
+    copies = [_copier_noeud(racine)]
+    for k in rangs:
+        pere = copies[-1]
+        f = pere.fils[k]
+        if f is None: raise ValueError(f"Case {k} vide sous '{pere.info}'")
+        copie = pere.fils[k] = _copier_noeud(f)
+        copie.pere, copie.rang = pere, k
+        copies.append(copie)
+    return copies
+
+def chemin_rangs(racine, val):
+    """
+    Suite des rangs menant de 'racine' au premier noeud (ordre préfixe) portant
+    'val', ou None. N'utilise pas les liens pere (valable sur une version persistante).
+    """
+    rangs, trouve = [], [False]
+    def entrer(n, pere, rang, prof):
+        if pere is not None: rangs.append(rang)
+        if n.info == val:
+            trouve[0] = True
+            return ARRET
+    def sortir(n, pere, rang, prof):
+        if pere is not None: rangs.pop()
+    parcours_profondeur(racine, entrer, sortir)
+    return rangs if trouve[0] else None
+
+def inserer_persistant(racine, rangs, info):
+    """Nouvelle version où 'info' est inséré sous le noeud désigné ; 'racine' si ce noeud est plein."""
+    pere = suivre_rangs(racine, rangs)
+    k = premier_libre(pere.fils)
+    if k < 0: return racine
+    copies = _copier_chemin(racine, rangs)
+    f = copies[-1].fils[k] = Noeud(info, len(pere.fils))
+    f.pere, f.rang = copies[-1], k
+    return copies[0]
+
+def modifier_persistant(racine, rangs, info):
+    """Nouvelle version où le noeud désigné porte 'info'."""
+    copies = _copier_chemin(racine, rangs)
+    copies[-1].info = info
+    return copies[0]
+
+def extraire_persistant(racine, rangs):
+    """
+    Retourne (nouvelle version sans le sous-arbre désigné, sous-arbre extrait).
+    Le sous-arbre extrait reste partagé avec les versions précédentes.
+    """
+    if not rangs: return None, racine
+    copies = _copier_chemin(racine, rangs[:-1])
+    extrait = copies[-1].fils[rangs[-1]]
+    copies[-1].fils[rangs[-1]] = None
+    return copies[0], extrait
+
+def supprimer_persistant(racine, rangs):
+    """Nouvelle version sans le sous-arbre désigné (la racine : arbre vide)."""
+    return extraire_persistant(racine, rangs)[0]
+
+def instantane(racine, cibles=()):
+    """
+    Instantané modifiable en place de l'arbre 'racine' : les chemins racine -> cible
+    (cibles et racine comprises) sont copiés, tout le reste est partagé. Les
+    modifications en place (inserer, modifier, supprimer, extraire...) portant sur
+    les cibles ou leurs ancêtres ne touchent alors que les copies : l'original
+    reste intact. Les liens pere des cibles sont requis (O(profondeur) par cible).
+    """
+    if racine is None: return None
+    copies = {id(racine): _copier_noeud(racine)}
+    for cible in cibles:
+        montee = chemin_vers_racine(cible)
+        if montee[-1] is not racine:
+            raise ValueError(f"Le noeud '{cible.info}' n'appartient pas à l'arbre")
+        pere = copies[id(racine)]
+        for n in reversed(montee[:-1]):
+            copie = copies.get(id(n))
+            if copie is None:
+                copie = copies[id(n)] = pere.fils[n.rang] = _copier_noeud(n)
+                copie.pere, copie.rang = pere, n.rang
+            pere = copie
+    return copies[id(racine)]
+
+class ArbrePersistant:
+    """
+    Historique des versions d'un arbre persistant.
+    - versions : liste des racines successives (versions[0] = arbre initial).
+    Chaque opération ajoute une version en O(profondeur) mémoire (plus la
+    recherche de la cible par valeur) ; annuler et revenir sont en O(1) par
+    version abandonnée. Les versions ne doivent pas être modifiées en place
+    (utiliser instantane pour obtenir une copie modifiable).
+    """
+    def __init__(self, racine=None):
+        self.versions = [racine]
+
+    def __len__(self):
+        return len(self.versions)
+
+    def racine(self, version=-1):
+        return self.versions[version]
+
+    def _cible(self, val):
+        return chemin_rangs(self.versions[-1], val) if self.versions[-1] is not None else None
+
+    def _ajouter(self, racine):
+        if racine is self.versions[-1]: return False
+        self.versions.append(racine)
+        return True
+
+    def inserer(self, val_pere, info):
+        """Insère 'info' sous le premier noeud portant 'val_pere'. Retourne False si impossible."""
+        rangs = self._cible(val_pere)
+        if rangs is None: return False
+        return self._ajouter(inserer_persistant(self.versions[-1], rangs, info))
+
+    def modifier(self, val, info):
+        rangs = self._cible(val)
+        if rangs is None: return False
+        return self._ajouter(modifier_persistant(self.versions[-1], rangs, info))
+
+    def supprimer(self, val):
+        rangs = self._cible(val)
+        if rangs is None: return False
+        return self._ajouter(supprimer_persistant(self.versions[-1], rangs))
+
+    def extraire(self, val):
+        """Retire le sous-arbre du premier noeud portant 'val' et le retourne (None si absent)."""
+        rangs = self._cible(val)
+        if rangs is None: return None
+        racine, extrait = extraire_persistant(self.versions[-1], rangs)
+        self.versions.append(racine)
+        return extrait
+
+    def annuler(self, nb=1):
+        """Abandonne les 'nb' dernières versions (la version initiale est conservée)."""
+        del self.versions[max(1, len(self.versions) - nb):]
+        return self.versions[-1]
+
+    def revenir(self, version):
+        """Revient à la version donnée en abandonnant toutes les suivantes."""
+        if version < 0: version += len(self.versions)
+        del self.versions[version + 1:]
+        return self.versions[-1]
+
+# --- Différences entre versions (diff / patch) ---
+# diff_arbres compare deux arbres case par case en descendant des racines et
+# ne descend que là où les empreintes diffèrent : un sous-arbre partagé (même
+# noeud, cas des versions persistantes) ou identique (même empreinte en cache)
+# est écarté en O(1). Le coût suit donc la taille de la modification, une fois
+# les empreintes de l'ancien arbre calculées. Le script produit est une liste
+# d'opérations dont les cibles sont désignées par leur suite de rangs dans
+# l'ancien arbre (chemin () : la racine) :
+#   ("supprimer", chemin)                       -> comme supprimer
+#   ("deplacer", chemin, chemin_pere, rang)     -> extraire puis greffer
+#   ("modifier", chemin, info)                  -> comme modifier
+#   ("inserer", chemin_pere, rang, sous_arbre)  -> copie de 'sous_arbre' greffée
+# Un sous-arbre retiré à un endroit et ajouté (à l'identique) ailleurs devient
+# un déplacement. Les opérations sont rangées par phase : détachements,
+# modifications, puis greffes, ce qui libère les cases avant de les réoccuper.
+
+def _copier_sous_arbre(racine):
+    """Copie complète d'un sous-arbre (pile explicite), empreintes en cache comprises."""
+    copie = Noeud(racine.info, len(racine.fils))
+    copie.empreinte = racine.empreinte
+    pile = [(racine, copie)]
+    while pile:
+        n, cn = pile.pop()
+        for k, f in fils_naires(n):
+            cf = cn.fils[k] = Noeud(f.info, len(f.fils))
+            cf.pere, cf.rang, cf.empreinte = cn, k, f.empreinte
+            pile.append((f, cf))
+    return copie
+
+def _deplier_chemin(lien):
+    """Chemin (tuple de rangs) d'un maillon (maillon_pere, rang) ; None désigne la racine."""
+    rangs = []
+    while lien is not None:
+        lien, k = lien
+        rangs.append(k)
+    rangs.reverse()
+    return tuple(rangs)
+
+def diff_arbres(ancien, nouveau):
+    """
+    Script d'édition transformant 'ancien' en un arbre identique à 'nouveau'
+    (mêmes infos dans les mêmes cases). Aucun des deux arbres n'est modifié,
+    hormis le calcul des empreintes manquantes. Deux fils de même rang et de
+    même info sont appariés et comparés récursivement ; d'infos différentes,
+    ils donnent un remplacement, sauf si l'un des deux sous-arbres se retrouve
+    ailleurs (déplacement) : ils sont alors appariés avec une modification.
+    Pendant la descente, les chemins sont des maillons (maillon_pere, rang)
+    partagés, dépliés seulement pour les opérations émises.
+    """
+    if ancien is nouveau: return []
+    if ancien is None or nouveau is None or len(ancien.fils) != len(nouveau.fils):
+        script = []
+        if ancien is not None: script.append(("supprimer", ()))
+        if nouveau is not None: script.append(("inserer", None, -1, nouveau))
+        return script
+    if empreintes(ancien) == empreintes(nouveau): return []
+    retires = {}  # empreinte -> [(maillon, noeud)] sous-arbres quittant leur case
+    ajouts = []   # (maillon_pere, rang, noeud) sous-arbres à placer
+    modifications = []
+    c = compteurs
+    paires, remplacements = [(ancien, nouveau, None)], []
+    while paires:
+        while paires:
+            if c is not None: c.visiter(len(paires))
+            a, b, lien = paires.pop()
+            if a.info != b.info: modifications.append(("modifier", _deplier_chemin(lien), b.info))
+            cases = dict(fils_naires(a))
+            for k, fb in fils_naires(b):
+                fa = cases.pop(k, None)
+                if fa is fb: continue
+                if fa is None:
+                    empreintes(fb)
+                    ajouts.append((lien, k, fb))
+                elif empreintes(fa) == empreintes(fb): continue
+                elif len(fa.fils) == len(fb.fils) and fa.info == fb.info:
+                    paires.append((fa, fb, (lien, k)))
+                elif len(fa.fils) == len(fb.fils):
+                    remplacements.append((fa, fb, lien, k))
+                else:
+                    retires.setdefault(fa.empreinte, []).append(((lien, k), fa))
+                    ajouts.append((lien, k, fb))
+            for k, fa in cases.items():
+                retires.setdefault(empreintes(fa), []).append(((lien, k), fa))
+        # Remplacements : déplacement si l'un des sous-arbres se retrouve ailleurs
+        # (y compris dans un autre remplacement, cas d'un échange de frères),
+        # sinon modification de l'info et comparaison des fils
+        sortants = set(retires).union(fa.empreinte for fa, _, _, _ in remplacements)
+        entrants = {fb.empreinte for _, _, fb in ajouts}.union(fb.empreinte for _, fb, _, _ in remplacements)
+        for fa, fb, lien, k in remplacements:
+            if fb.empreinte in sortants or fa.empreinte in entrants:
+                retires.setdefault(fa.empreinte, []).append(((lien, k), fa))
+                ajouts.append((lien, k, fb))
+            else:
+                paires.append((fa, fb, (lien, k)))
+        remplacements = []
+    deplacements, insertions = [], []
+    for lien, k, fb in ajouts:
+        candidats = retires.get(fb.empreinte)
+        if candidats:
+            source = _deplier_chemin(candidats.pop()[0])
+            deplacements.append(("deplacer", source, _deplier_chemin(lien), k))
+        else:
+            insertions.append(("inserer", _deplier_chemin(lien), k, fb))
+    suppressions = [("supprimer", _deplier_chemin(lien)) for liste in retires.values() for lien, _ in liste]
+    return suppressions + deplacements + modifications + insertions
+
+def appliquer_diff(racine, script, index=None):
+    """
+    Applique en place un script de diff_arbres à 'racine' (l'ancien arbre, ou
+    une copie identique) et retourne la racine (None ou nouvelle racine si le
+    script la remplace). Tous les chemins (suites de rangs dans l'arbre
+    d'origine) sont résolus en noeuds par suivre_rangs avant toute modification,
+    puis les opérations sont exécutées par phase en un seul passage :
+    détachements, modifications, greffes. Les sous-arbres insérés sont copiés.
+    Chaque opération passe par couper, modifier ou greffer : tables de noms et
+    index éventuel sont tenus à jour. Une coupe ou une greffe appelle
+    signaler_modification sur le père touché (agrégats et empreintes du chemin
+    vers la racine, index globaux qui numérotent ce père) ; une modification
+    d'info n'invalide que les empreintes.
+    """
+    def resoudre(chemin):
+        try: n = suivre_rangs(racine, chemin)
+        except (AttributeError, IndexError): n = None
+        if n is None: raise ValueError(f"Chemin {list(chemin)} absent de l'arbre")
+        return n
+    detachements, modifications, greffes = [], [], []
+    for op in script:
+        genre = op[0]
+        if genre in ("supprimer", "deplacer"):
+            chemin = op[1]
+            pere = resoudre(chemin[:-1]) if chemin else None
+            noeud = resoudre(chemin)
+            detachements.append((pere, chemin[-1] if chemin else -1, noeud, genre == "supprimer"))
+            if genre == "deplacer": greffes.append((resoudre(op[2]), op[3], noeud, False))
+        elif genre == "modifier":
+            modifications.append((resoudre(op[1]), op[2]))
+        elif genre == "inserer":
+            pere = resoudre(op[1]) if op[1] is not None else None
+            greffes.append((pere, op[2], op[3], True))
+        else:
+            raise ValueError(f"Opération inconnue : {genre}")
+    for pere, k, noeud, retire in detachements:
+        if pere is None:
+            if index is not None: index.vider()
+            racine = None
+            continue
+        couper(pere, k)
+        if retire and index is not None: index.desindexer_sous_arbre(noeud)
+    for noeud, info in modifications: modifier(noeud, info, index)
+    for pere, k, noeud, copie in greffes:
+        if copie: noeud = _copier_sous_arbre(noeud)
+        if pere is None:
+            racine = noeud
+            if index is not None: index.indexer_sous_arbre(racine)
+        elif not greffer(pere, noeud, k, index if copie else None):
+            raise ValueError(f"Case {k} occupée sous '{pere.info}'")
+    return racine
+
+def _version_modifiee(arbre, cibles):
+    """
+    Nouvelle version persistante de 'arbre' où les noeuds 'cibles' (liens pere
+    requis) sont tour à tour modifiés, complétés d'un fils ou supprimés.
+    """
+    rangs_cibles = [rangs_depuis(arbre, c) for c in cibles]
+    version, suppressions = arbre, []
+    for i, rangs in enumerate(rangs_cibles):
+        if i % 3 == 0: version = modifier_persistant(version, rangs, f"MOD{i}")
+        elif i % 3 == 1: version = inserer_persistant(version, rangs, f"AJOUT{i}")
+        elif rangs: suppressions.append(rangs)
+    # Les plus profondes d'abord : un ancêtre supprimé emporte ses descendants
+    for rangs in sorted(suppressions, key=len, reverse=True):
+        try: version = supprimer_persistant(version, rangs)
+        except ValueError: pass # Déjà emporté par un ancêtre
+    return version
+
+def bench_diff(n, changements=(1, 10, 100, 1000), graine=0):
+    """
+    Coût de diff_arbres et appliquer_diff en fonction du nombre de noeuds
+    touchés entre deux versions d'un arbre de n noeuds (empreintes de l'ancienne
+    version en cache), comparé à la reconstruction complète de la nouvelle version.
+    Retourne {changements: (opérations, diff, patch, reconstruction)} en secondes.
+    """
+    arbre = const_arbre_aleatoire(n)
+    empreintes(arbre)
+    noeuds = list(iter_bfs(arbre))
+    rnd = random.Random(graine)
+    resultats = {}
+    for k in changements:
+        cibles = rnd.sample(noeuds, min(k, len(noeuds)))
+        version = _version_modifiee(arbre, cibles)
+        t0 = time.perf_counter()
+        script = diff_arbres(arbre, version)
+        t1 = time.perf_counter()
+        copie = instantane(arbre, cibles) # Seuls les chemins touchés sont copiés
+        t2 = time.perf_counter()
+        appliquer_diff(copie, script)
+        t3 = time.perf_counter()
+        _copier_sous_arbre(version)
+        t4 = time.perf_counter()
+        resultats[k] = (len(script), t1 - t0, t3 - t2, t4 - t3)
+        print(f"n={n} {k} noeud(s) touché(s) : {len(script)} opérations, diff {t1 - t0:.6f}s, "
+              f"patch {t3 - t2:.6f}s, reconstruction {t4 - t3:.6f}s")
+    return resultats
+
+# --- Plus proche ancêtre commun (LCA) ---
+
+class IndexArbre:
+    """
+    Base des index construits sur un arbre entier (IndexLCA, EtiquetageIntervalle).
+    - noeuds : noeuds numérotés ; num : id(noeud) -> numéro.
+    L'index écoute signaler_modification : une modification sous l'un de ses
+    noeuds le périme, et il se reconstruit à la requête suivante ; les
+    modifications d'autres arbres (ou d'un sous-arbre déjà extrait, une fois
+    l'index reconstruit) ne le touchent pas.
+    """
+    def __init__(self, racine):
+        self.racine = racine
+        self.noeuds, self.num = [], {}
+        _index_a_l_ecoute.add(self)
+        self.construire()
+
+    def signaler(self, pere):
+        """Appelé par signaler_modification : périme l'index si 'pere' en fait partie."""
+        if self.perime: return
+        i = self.num.get(id(pere))
+        if i is not None and self.noeuds[i] is pere: self.perime = True
+
+    def invalider(self):
+        """Force la reconstruction à la prochaine requête."""
+        self.perime = True
+
+    def est_perime(self):
+        return self.perime
+
+    def _a_jour(self):
+        if self.perime: self.construire()
+
+class IndexLCA(IndexArbre):
+    """
+    Structure de requêtes de chemins entre noeuds quelconques, construite une
+    fois par arbre en O(n log n) : tour d'Euler + table clairsemée (sparse table)
+    des minimums de profondeur.
+    - lca(a, b), distance(a, b) : O(1).
+    - chemin_entre(a, b) : liste a -> ... -> LCA -> ... -> b, O(longueur).
+    - versions *_lot : nombreuses paires à la fois (vectorisé si NumPy est présent).
+    L'index se reconstruit automatiquement à la requête suivante si son arbre a
+    changé de structure depuis (voir IndexArbre), ou après invalider().
+    """
+
+    def construire(self):
+        """Tour d'Euler itératif puis table clairsemée (un niveau par puissance de 2)."""
+        noeuds, num, prof, peres, premier, euler = [], {}, [], [], [], []
+        def enregistrer(n, p):
+            i = len(noeuds)
+            noeuds.append(n)
+            num[id(n)] = i
+            prof.append(prof[p] + 1 if p >= 0 else 0)
+            peres.append(p)
+            premier.append(len(euler))
+            euler.append(i)
+            return i
+        if self.racine is not None:
+            c = compteurs
+            pile = [[fils_naires(self.racine), 0, enregistrer(self.racine, -1)]]
+            while pile:
+                cadre = pile[-1]
+                presents, k, i = cadre
+                if k == len(presents):
+                    pile.pop()
+                    if pile: euler.append(pile[-1][2]) # Retour au père
+                    continue
+                cadre[1] = k + 1
+                f = presents[k][1]
+                pile.append([fils_naires(f), 0, enregistrer(f, i)])
+                if c is not None: c.visiter(len(pile))
+            if c is not None: c.visiter(1) # La racine
+        self.noeuds, self.num, self.peres = noeuds, num, peres
+        self.prof = _colonne(prof)
+        self.premier = _colonne(premier)
+        # table[j][i] : noeud le moins profond de euler[i : i + 2^j]
+        table = [_colonne(euler)]
+        j = 1
+        while (1 << j) <= len(euler):
+            prec, demi = table[-1], 1 << (j - 1)
+            a, b = prec[:len(prec) - demi], prec[demi:]
+            if np is not None:
+                table.append(np.where(self.prof[a] <= self.prof[b], a, b))
+            else:
+                table.append(array('i', (x if prof[x] <= prof[y] else y for x, y in zip(a, b))))
+            j += 1
+        self.table = table
+        self.perime = False
+
+    def _indice(self, noeud):
+        i = self.num.get(id(noeud))
+        if i is None or self.noeuds[i] is not noeud:
+            raise ValueError("Noeud absent de l'arbre indexé")
+        return i
+
+    def _lca_indices(self, i, j):
+        l, r = int(self.premier[i]), int(self.premier[j])
+        if l > r: l, r = r, l
+        k = (r - l + 1).bit_length() - 1
+        x, y = self.table[k][l], self.table[k][r - (1 << k) + 1]
+        return x if self.prof[x] <= self.prof[y] else y
+
+    def lca(self, a, b):
+        """Plus proche ancêtre commun de a et b."""
+        self._a_jour()
+        return self.noeuds[self._lca_indices(self._indice(a), self._indice(b))]
+
+    def distance(self, a, b):
+        """Nombre d'arêtes entre a et b."""
+        self._a_jour()
+        i, j = self._indice(a), self._indice(b)
+        return int(self.prof[i] + self.prof[j] - 2 * self.prof[self._lca_indices(i, j)])
+
+    def chemin_entre(self, a, b):
+        """Liste des noeuds du chemin a -> LCA -> b (a et b compris)."""
+        self._a_jour()
+        i, j = self._indice(a), self._indice(b)
+        c = self._lca_indices(i, j)
+        montee, descente = [], []
+        while i != c:
+            montee.append(self.noeuds[i])
+            i = self.peres[i]
+        while j != c:
+            descente.append(self.noeuds[j])
+            j = self.peres[j]
+        montee.append(self.noeuds[c])
+        montee.extend(reversed(descente))
+        return montee
+
+    def lca_lot(self, paires):
+        """LCA d'une liste de paires (a, b) ; un seul calcul vectorisé avec NumPy."""
+        self._a_jour()
+        paires = list(paires)
+        if np is None or not paires:
+            return [self.noeuds[self._lca_indices(self._indice(a), self._indice(b))] for a, b in paires]
+        i = np.fromiter((self._indice(a) for a, _ in paires), dtype=np.int64, count=len(paires))
+        j = np.fromiter((self._indice(b) for _, b in paires), dtype=np.int64, count=len(paires))
+        l, r = np.minimum(self.premier[i], self.premier[j]), np.maximum(self.premier[i], self.premier[j])
+        k = np.floor(np.log2(r - l + 1)).astype(np.int64)
+        res = np.empty(len(paires), dtype=np.int64)
+        for niveau in np.unique(k): # Un groupe par niveau de la table
+            m = k == niveau
+            x = self.table[niveau][l[m]]
+            y = self.table[niveau][r[m] - (1 << int(niveau)) + 1]
+            res[m] = np.where(self.prof[x] <= self.prof[y], x, y)
+        return [self.noeuds[c] for c in res]
+
+    def distances_lot(self, paires):
+        """Distances pour une liste de paires (a, b)."""
+        paires = list(paires)
+        lcas = self.lca_lot(paires)
+        return [int(self.prof[self._indice(a)] + self.prof[self._indice(b)] - 2 * self.prof[self.num[id(c)]])
+                for (a, b), c in zip(paires, lcas)]
+
+    def chemins_lot(self, paires):
+        """Chemins complets pour une liste de paires (a, b)."""
+        return [self.chemin_entre(a, b) for a, b in paires]
+
+# --- Numérotation par intervalles (entrée / sortie) ---
+
+class EtiquetageIntervalle(IndexArbre):
+    """
+    Étiquetage de l'arbre en un seul parcours préfixe (pile explicite) : le
+    noeud de numéro d'entrée i (son rang dans l'ordre préfixe) a pour sous-arbre
+    l'intervalle contigu [i, fin[i]] de ce même ordre. Colonnes compactes :
+    - fin  : numéro d'entrée du dernier descendant (i pour une feuille) ;
+    - prof : profondeur ; peres : numéro du père (-1 pour la racine).
+    Requêtes en O(1) : est_ancetre, taille, profondeur, entree, sortie (numéro
+    postfixe), pere, kieme (k-ième noeud en ordre préfixe). Comme IndexLCA,
+    l'étiquetage est refait à la requête suivante si son arbre a changé de
+    structure (inserer, supprimer, extraire... via signaler_modification) ;
+    modifier ne le périme pas.
+    """
+
+    def construire(self):
+        """Numérotation préfixe puis fins d'intervalles (remontée en ordre inverse), O(n)."""
+        noeuds, num, prof, peres = [], {}, [], []
+        c = compteurs
+        pile = [(self.racine, -1, 0)] if self.racine is not None else []
+        while pile:
+            if c is not None: c.visiter(len(pile))
+            n, p, d = pile.pop()
+            num[id(n)] = len(noeuds)
+            noeuds.append(n)
+            peres.append(p)
+            prof.append(d)
+            i = len(noeuds) - 1
+            pile.extend((f, i, d + 1) for _, f in reversed(fils_naires(n)))
+        # Les descendants suivent leur ancêtre : une passe en ordre inverse suffit
+        fin = list(range(len(noeuds)))
+        for i in range(len(noeuds) - 1, 0, -1):
+            p = peres[i]
+            if fin[i] > fin[p]: fin[p] = fin[i]
+        self.noeuds, self.num = noeuds, num
+        self.fin, self.prof, self.peres = _colonne(fin), _colonne(prof), _colonne(peres)
+        self.perime = False
+
+    def _indice(self, noeud):
+        i = self.num.get(id(noeud))
+        if i is None or self.noeuds[i] is not noeud:
+            raise ValueError("Noeud absent de l'arbre étiqueté")
+        return i
+
+    def __len__(self):
+        self._a_jour()
+        return len(self.noeuds)
+
+    def contient(self, noeud):
+        """Vrai si 'noeud' appartient à l'arbre étiqueté."""
+        self._a_jour()
+        i = self.num.get(id(noeud))
+        return i is not None and self.noeuds[i] is noeud
+
+    def entree(self, noeud):
+        """Numéro d'entrée (rang en ordre préfixe)."""
+        self._a_jour()
+        return self._indice(noeud)
+
+    def sortie(self, noeud):
+        """Numéro de sortie (rang en ordre postfixe) : entree - profondeur + taille - 1."""
+        self._a_jour()
+        i = self._indice(noeud)
+        return int(self.fin[i] - self.prof[i])
+
+    def est_ancetre(self, a, b):
+        """Vrai si 'a' est un ancêtre de 'b' (ou 'b' lui-même) : inclusion d'intervalles."""
+        self._a_jour()
+        i, j = self._indice(a), self._indice(b)
+        return i <= j <= self.fin[i]
+
+    def taille(self, noeud):
+        """Nombre de noeuds du sous-arbre de 'noeud'."""
+        self._a_jour()
+        i = self._indice(noeud)
+        return int(self.fin[i]) - i + 1
+
+    def profondeur(self, noeud):
+        self._a_jour()
+        return int(self.prof[self._indice(noeud)])
+
+    def pere(self, noeud):
+        """Père de 'noeud' (None pour la racine), sans lien pere ni recherche."""
+        self._a_jour()
+        p = int(self.peres[self._indice(noeud)])
+        return self.noeuds[p] if p >= 0 else None
+
+    def kieme(self, k):
+        """k-ième noeud (à partir de 0) de l'ordre préfixe."""
+        self._a_jour()
+        return self.noeuds[k]
+
+    def sous_arbre(self, noeud):
+        """Noeuds du sous-arbre de 'noeud' en ordre préfixe (tranche de l'étiquetage)."""
+        self._a_jour()
+        i = self._indice(noeud)
+        return self.noeuds[i:int(self.fin[i]) + 1]
+
+    def ecrire_sous_arbre(self, noeud, flux=None, prefix="", is_last=True):
+        """
+        Rendu ASCII du sous-arbre de 'noeud' lu directement dans l'étiquetage :
+        l'intervalle [i, fin[i]] donne l'ordre préfixe et les profondeurs, et un
+        noeud est le dernier fils de son père si leurs intervalles finissent ensemble.
+        Retourne le nombre de noeuds écrits.
+        """
+        self._a_jour()
+        i = self._indice(noeud)
+        j = int(self.fin[i]) + 1
+        # Tranches de l'intervalle seulement (indices relatifs à i)
+        fin, prof, peres = self.fin[i:j].tolist(), self.prof[i:j].tolist(), self.peres[i:j].tolist()
+        conn_vrai, conn_faux, seg_vrai, seg_faux = SYMBOLES_NAIRE
+        tampon = TamponSortie(flux if flux is not None else sys.stdout)
+        base, prefixes = prof[0], [prefix]
+        for k, n in enumerate(self.noeuds[i:j]):
+            d = prof[k] - base
+            dernier = is_last if k == 0 else fin[k] == fin[peres[k] - i]
+            pref = prefixes[d]
+            tampon.ecrire(pref, conn_vrai if dernier else conn_faux, str(n.info), "\n")
+            del prefixes[d + 1:]
+            prefixes.append(pref + (seg_vrai if dernier else seg_faux))
+        tampon.vider()
+        return j - i
+
+# ==========================================
+# 4. STOCKAGE COMPACT EN COLONNES
+# ==========================================
+
+class ArbreTableau:
+    """
+    Représentation compacte d'un arbre N-aire sous forme de colonnes contiguës
+    (alternative aux objets Noeud pour les très grands arbres).
+    - infos : table des valeurs distinctes (chaque info n'est stockée qu'une fois).
+    - ids   : colonne int32 de taille n, indice de l'info de chaque noeud dans 'infos'.
+    - fils  : table des fils n x arite (int32), -1 pour une case vide.
+    - peres, profondeurs : colonnes optionnelles (int32), calculées à la demande.
+    Invariant : les noeuds sont numérotés dans l'ordre du parcours en largeur
+    (la racine est 0, un fils a toujours un indice supérieur à celui de son père).
+    Les tableaux sont des ndarray NumPy si disponible, sinon des array('i')
+    (la table des fils est alors aplatie ligne par ligne).
+    """
+    def __init__(self, ids, fils, infos, arite=N):
+        self.arite = arite
+        self.ids = ids
+        self.fils = fils
+        self.infos = infos
+        self.peres = None
+        self.profondeurs = None
+
+    # --- Conversions ---
+    @classmethod
+    def depuis_noeuds(cls, racine, arite=None):
+        """
+        Construit la représentation en colonnes à partir d'un arbre de Noeud (BFS).
+        L'arité de la table est par défaut celle de la racine.
+        """
+        if arite is None: arite = len(racine.fils) if racine is not None else N
+        ids, plat, infos, codes = [], [], [], {}
+        if racine is not None:
+            c = compteurs
+            file = deque([racine])
+            suivant = 1 # Indice BFS du prochain fils rencontré
+            while file:
+                if c is not None: c.visiter(len(file))
+                n = file.popleft()
+                code = codes.get(n.info)
+                if code is None:
+                    code = codes[n.info] = len(infos)
+                    infos.append(n.info)
+                ids.append(code)
+                if type(n.fils) is list:
+                    for f in n.fils:
+                        if f is None:
+                            plat.append(-1)
+                        else:
+                            plat.append(suivant)
+                            suivant += 1
+                            file.append(f)
+                    continue
+                ligne = [-1] * arite
+                for k, f in n.fils.occupes():
+                    ligne[k] = suivant
+                    suivant += 1
+                    file.append(f)
+                plat.extend(ligne)
+        return cls(_colonne(ids), _table(plat, arite), infos, arite)
+
+    def vers_noeuds(self):
+        """Reconstruit l'arbre de Noeud équivalent (liens pere/rang compris)."""
+        n = len(self)
+        if n == 0: return None
+        noeuds = [Noeud(self.infos[c], self.arite) for c in self.ids]
+        for i, pere in enumerate(noeuds):
+            for k, j in enumerate(self.fils_de(i)):
+                if j >= 0:
+                    pere.fils[k] = noeuds[j]
+                    noeuds[j].pere, noeuds[j].rang = pere, k
+        return noeuds[0]
+
+    # --- Requêtes sur un sous-arbre (sans construire de Noeud) ---
+    def indices_sous_arbre(self, i):
+        """Génère les indices du sous-arbre de racine i, en ordre BFS."""
+        file = deque([i])
+        while file:
+            j = file.popleft()
+            yield j
+            file.extend(k for k in self.fils_de(j) if k >= 0)
+
+    def taille_sous_arbre(self, i):
+        return sum(1 for _ in self.indices_sous_arbre(i))
+
+    def hauteur_sous_arbre(self, i):
+        """Nombre de niveaux du sous-arbre de racine i."""
+        h, niveau = 0, [i]
+        while niveau:
+            h += 1
+            niveau = [k for j in niveau for k in self.fils_de(j) if k >= 0]
+        return h
+
+    def sous_arbre(self, i):
+        """Matérialise à la demande le sous-arbre de racine i en objets Noeud."""
+        racine = Noeud(self.info(i), self.arite)
+        file = deque([(i, racine)])
+        while file:
+            j, pere = file.popleft()
+            for k, c in enumerate(self.fils_de(j)):
+                if c >= 0:
+                    f = pere.fils[k] = Noeud(self.info(c), self.arite)
+                    f.pere, f.rang = pere, k
+                    file.append((c, f))
+        return racine
+
+    # --- Accès élémentaires ---
+    def __len__(self):
+        return len(self.ids)
+
+    def info(self, i):
+        return self.infos[self.ids[i]]
+
+    def fils_de(self, i):
+        """Retourne la ligne i de la table des fils (arite entiers, -1 si vide)."""
+        if np is not None: return self.fils[i].tolist()
+        return self.fils[i * self.arite:(i + 1) * self.arite].tolist()
+
+    def _plat(self):
+        """Table des fils aplatie (vue, sans copie)."""
+        return self.fils.reshape(-1) if np is not None else self.fils
+
+    # --- Colonnes optionnelles ---
+    def calculer_peres(self):
+        """Remplit la colonne 'peres' (-1 pour la racine)."""
+        n, plat = len(self), self._plat()
+        if np is not None:
+            peres = np.full(n, -1, dtype=np.int32)
+            occ = plat >= 0
+            peres[plat[occ]] = np.nonzero(occ)[0] // self.arite
+        else:
+            peres = array('i', [-1]) * n
+            for pos, j in enumerate(plat):
+                if j >= 0: peres[j] = pos // self.arite
+        self.peres = peres
+        return peres
+
+    def niveaux(self):
+        """
+        Retourne les bornes [début, fin) de chaque niveau.
+        Grâce à l'ordre BFS, les fils d'un niveau forment un bloc contigu d'indices :
+        un seul comptage (vectorisé) des cases occupées par niveau suffit.
+        """
+        n, plat, A = len(self), self._plat(), self.arite
+        bornes, debut, fin = [], 0, min(n, 1)
+        while debut < fin:
+            bornes.append((debut, fin))
+            bloc = plat[debut * A:fin * A]
+            nb = int((bloc >= 0).sum()) if np is not None else sum(1 for j in bloc if j >= 0)
+            debut, fin = fin, fin + nb
+        return bornes
+
+    def calculer_profondeurs(self):
+        """Remplit la colonne 'profondeurs' (0 pour la racine)."""
+        bornes = self.niveaux()
+        if np is not None:
+            tailles = [fin - debut for debut, fin in bornes]
+            prof = np.repeat(np.arange(len(bornes), dtype=np.int32), tailles)
+        else:
+            prof = array('i')
+            for d, (debut, fin) in enumerate(bornes):
+                prof.extend([d] * (fin - debut))
+        self.profondeurs = prof
+        return prof
+
+    # --- Opérations vectorisées ---
+    def hauteur(self):
+        """Hauteur = nombre de niveaux (un comptage vectorisé par niveau)."""
+        return len(self.niveaux())
+
+    def nb_noeuds(self):
+        return len(self)
+
+    def est_complet(self):
+        """
+        En ordre BFS, les cases occupées de la table aplatie contiennent 1..n-1
+        dans l'ordre : l'arbre est complet (au sens de est_complet) si et
+        seulement si ces n-1 cases forment un préfixe de la table.
+        """
+        n = len(self)
+        if n <= 1: return True
+        prefixe = self._plat()[:n - 1]
+        if np is not None: return bool((prefixe >= 0).all())
+        return all(j >= 0 for j in prefixe)
+
+    def ordre_largeur(self):
+        """Indices des noeuds dans l'ordre BFS (identité par construction)."""
+        if np is not None: return np.arange(len(self), dtype=np.int32)
+        return array('i', range(len(self)))
+
+    def tailles_sous_arbres(self):
+        """Taille de chaque sous-arbre, calculée niveau par niveau de bas en haut."""
+        n = len(self)
+        if np is not None:
+            tailles = np.ones(n, dtype=np.int64)
+            for debut, fin in reversed(self.niveaux()):
+                bloc = self.fils[debut:fin]
+                tailles[debut:fin] += np.where(bloc >= 0, tailles[bloc], 0).sum(axis=1)
+            return tailles
+        tailles = array('q', [1]) * n
+        for i in range(n - 1, -1, -1):
+            for j in self.fils_de(i):
+                if j >= 0: tailles[i] += tailles[j]
+        return tailles
+
+    def ordre_profondeur(self):
+        """
+        Indices des noeuds dans l'ordre DFS préfixe (celui de afficher_parcours).
+        Rang préfixe d'un fils = rang du père + 1 + tailles des frères précédents,
+        calculé niveau par niveau de haut en bas.
+        """
+        n = len(self)
+        if np is not None:
+            if n == 0: return np.empty(0, dtype=np.int32)
+            tailles = self.tailles_sous_arbres()
+            pos = np.zeros(n, dtype=np.int64)
+            for debut, fin in self.niveaux():
+                bloc = self.fils[debut:fin]
+                occ = bloc >= 0
+                t = np.where(occ, tailles[bloc], 0)
+                decal = pos[debut:fin, None] + 1 + np.cumsum(t, axis=1) - t
+                pos[bloc[occ]] = decal[occ]
+            ordre = np.empty(n, dtype=np.int32)
+            ordre[pos] = np.arange(n, dtype=np.int32)
+            return ordre
+        ordre = array('i')
+        pile = [0] if n else []
+        while pile:
+            i = pile.pop()
+            ordre.append(i)
+            pile.extend(j for j in reversed(self.fils_de(i)) if j >= 0)
+        return ordre
+
+    # --- Analyse sur les colonnes (tâches de analyser_parallele) ---
+    def resumes(self):
+        """
+        Résumé (hauteur, parfait, complet, taille) de la racine et plus grand
+        sous-arbre complet (taille, indice du noeud, -1 si vide), calculés de bas
+        en haut sur les colonnes sans créer de Noeud. Mêmes valeurs que
+        agregats() sur l'arbre de Noeud équivalent : avec NumPy, un calcul
+        vectorisé par niveau (règle de combiner_resumes appliquée à toutes les
+        lignes du niveau) ; sinon combiner_resumes noeud par noeud.
+        """
+        n = len(self)
+        if n == 0: return RESUME_VIDE, 0, -1
+        if np is None: return self._resumes_boucle()
+        A = self.arite
+        h = np.zeros(n, dtype=np.int32)
+        parf = np.zeros(n, dtype=bool)
+        compl = np.zeros(n, dtype=bool)
+        taille = np.ones(n, dtype=np.int64)
+        best_n = np.zeros(n, dtype=np.int64)
+        best = np.arange(n, dtype=np.int64)
+        for debut, fin in reversed(self.niveaux()):
+            bloc = self.fils[debut:fin]
+            occ = bloc >= 0
+            j = np.where(occ, bloc, 0)
+            lignes = np.arange(fin - debut)
+            # Résumés des cases (case vide : RESUME_VIDE)
+            H = np.where(occ, h[j], 0)
+            P = np.where(occ, parf[j], True)
+            K = np.where(occ, compl[j], True)
+            hn = 1 + H.max(axis=1)
+            h1, h2 = (hn - 1)[:, None], (hn - 2)[:, None]
+            # Cases de tête parfaites de hauteur h-1 ; toutes : noeud parfait
+            tete = np.cumprod(P & (H == h1), axis=1).sum(axis=1)
+            parfait = tete == A
+            # suite[:, k] : les cases après k sont toutes parfaites de hauteur h-2
+            B = P & (H == h2)
+            suite = np.ones_like(B)
+            suite[:, :-1] = np.flip(np.cumprod(np.flip(B[:, 1:], axis=1), axis=1), axis=1).astype(bool)
+            k = np.minimum(tete, A - 1)
+            Hk, Pk, Kk = H[lignes, k], P[lignes, k], K[lignes, k]
+            charniere = (Kk & (Hk == hn - 1)) | (Pk & (Hk == hn - 2))
+            complet = parfait | (charniere & suite[lignes, k])
+            h[debut:fin], parf[debut:fin], compl[debut:fin] = hn, parfait, complet
+            taille[debut:fin] += np.where(occ, taille[j], 0).sum(axis=1)
+            # Premier meilleur fils (argmax rend la première case maximale)
+            Bn = np.where(occ, best_n[j], -1)
+            a = Bn.argmax(axis=1)
+            best_n[debut:fin] = np.where(complet, taille[debut:fin], Bn[lignes, a])
+            best[debut:fin] = np.where(complet, np.arange(debut, fin), best[j[lignes, a]])
+        resume = (int(h[0]), bool(parf[0]), bool(compl[0]), int(taille[0]))
+        return resume, int(best_n[0]), int(best[0])
+
+    def _resumes_boucle(self):
+        """Version sans NumPy de resumes() (indices décroissants : fils avant pères)."""
+        n = len(self)
+        res, best_n, best = [None] * n, [0] * n, [-1] * n
+        for i in range(n - 1, -1, -1):
+            cases = self.fils_de(i)
+            r = combiner_resumes([RESUME_VIDE if j < 0 else res[j] for j in cases])
+            if r[2]: bn, bi = r[3], i
+            else:
+                bn, bi = 0, -1
+                for j in cases:
+                    if j >= 0 and best_n[j] > bn: bn, bi = best_n[j], best[j]
+            res[i], best_n[i], best[i] = r, bn, bi
+        return res[0], best_n[0], best[0]
+
+    def indice_info(self, val):
+        """Indice de 'val' dans la table des infos, ou -1."""
+        if isinstance(self.infos, (TableChaines, NomsGeneres)): return self.infos.indice(val)
+        try: return self.infos.index(val)
+        except ValueError: return -1
+
+    def rechercher(self, val):
+        """Indice du premier noeud portant 'val' en ordre préfixe (comme rechercher), ou -1."""
+        code = self.indice_info(val)
+        if code < 0: return -1
+        if np is not None: candidats = np.flatnonzero(np.asarray(self.ids) == code).tolist()
+        else: candidats = [i for i, c in enumerate(self.ids) if c == code]
+        if len(candidats) <= 1: return candidats[0] if candidats else -1
+        candidats = set(candidats)
+        return next(i for i in self.ordre_profondeur() if int(i) in candidats)
+
+    def rangs(self, i):
+        """Suite des rangs menant de la racine au noeud i (colonne 'peres' calculée au besoin)."""
+        if self.peres is None: self.calculer_peres()
+        rangs = []
+        while i > 0:
+            p = int(self.peres[i])
+            rangs.append(self.fils_de(p).index(i))
+            i = p
+        rangs.reverse()
+        return rangs
+
+def _colonne(valeurs):
+    """Colonne contiguë d'entiers 32 bits (NumPy si disponible)."""
+    if np is not None: return np.array(valeurs, dtype=np.int32)
+    return array('i', valeurs)
+
+def _table(plat, arite):
+    """Table des fils n x arite à partir de sa forme aplatie."""
+    if np is not None: return np.array(plat, dtype=np.int32).reshape(-1, arite)
+    return array('i', plat)
+
+# ==========================================
+# 5. SERIALISATION BINAIRE
+# ==========================================
+# Format (petit-boutiste) :
+#   - en-tête : magie b"NARB", version, arité N, nombre de noeuds n, nombre de chaînes m
+#   - table des fils en ordre de largeur : n x N entiers int32 (-1 = case vide)
+#   - identifiants d'info : n entiers int32 (indices dans la table des chaînes)
+#   - table des chaînes : m+1 décalages int64 (alignés sur 8 octets) puis les octets UTF-8
+# C'est exactement la disposition de ArbreTableau : le chargement par mmap ne
+# recopie rien, les colonnes sont des vues sur le fichier.
+
+MAGIE = b"NARB"
+VERSION_FORMAT = 1
+ENTETE = struct.Struct("<4sIIQQ4x")
+
+class TableChaines:
+    """Table de chaînes en lecture seule, décodée à la demande depuis un tampon."""
+    def __init__(self, octets, decalages):
+        self.octets = octets
+        self.decalages = decalages
+
+    def __len__(self):
+        return len(self.decalages) - 1
+
+    def __getitem__(self, k):
+        k = int(k)
+        debut, fin = int(self.decalages[k]), int(self.decalages[k + 1])
+        return bytes(self.octets[debut:fin]).decode("utf-8")
+
+    def indice(self, val):
+        """
+        Indice de la chaîne 'val' dans la table, ou -1 : recherche de ses octets
+        dans le bloc des chaînes, puis contrôle qu'une occurrence coïncide avec
+        une entrée (décalages triés), sans décoder la table.
+        """
+        if not isinstance(val, str): return -1
+        cible, bloc = val.encode("utf-8"), bytes(self.octets)
+        pos = bloc.find(cible)
+        while pos >= 0:
+            if np is not None: k = int(np.searchsorted(self.decalages, pos))
+            else: k = bisect.bisect_left(self.decalages, pos)
+            if k < len(self) and self.decalages[k] == pos and self.decalages[k + 1] == pos + len(cible):
+                return k
+            pos = bloc.find(cible, pos + 1)
+        return -1
+
+def _octets_entiers(colonne, code):
+    """Octets petit-boutistes d'une colonne d'entiers ('i' : int32, 'q' : int64)."""
+    if np is not None and isinstance(colonne, np.ndarray):
+        return colonne.astype("<i4" if code == "i" else "<i8").tobytes()
+    tab = array(code, colonne)
+    if sys.byteorder == "big": tab.byteswap()
+    return tab.tobytes()
+
+def _vue_entiers(tampon, debut, nb, code):
+    """Colonne d'entiers lue dans le tampon, sans copie si possible."""
+    if np is not None:
+        return np.frombuffer(tampon, dtype="<i4" if code == "i" else "<i8", count=nb, offset=debut)
+    taille = array(code).itemsize
+    vue = tampon[debut:debut + nb * taille]
+    if sys.byteorder == "big":
+        tab = array(code, bytes(vue))
+        tab.byteswap()
+        return tab
+    return vue.cast(code)
+
+def _morceaux_binaires(arbre):
+    """Génère les blocs d'octets du format binaire pour un Noeud ou un ArbreTableau."""
+    tab = arbre if isinstance(arbre, ArbreTableau) else ArbreTableau.depuis_noeuds(arbre)
+    chaines = [tab.infos[k] for k in range(len(tab.infos))]
+    if not all(isinstance(c, str) for c in chaines):
+        raise TypeError("Seules les infos de type str peuvent être sérialisées")
+    encodees = [c.encode("utf-8") for c in chaines]
+    decalages = [0]
+    for e in encodees: decalages.append(decalages[-1] + len(e))
+    n, m = len(tab), len(encodees)
+    yield ENTETE.pack(MAGIE, VERSION_FORMAT, tab.arite, n, m)
+    yield _octets_entiers(tab._plat(), "i")
+    yield _octets_entiers(tab.ids, "i")
+    yield b"\0" * (-(ENTETE.size + 4 * n * (tab.arite + 1)) % 8) # Alignement
+    yield _octets_entiers(decalages, "q")
+    yield b"".join(encodees)
+
+def serialiser_arbre(arbre):
+    """Retourne la forme binaire compacte (bytes) d'un arbre (Noeud ou ArbreTableau)."""
+    return b"".join(_morceaux_binaires(arbre))
+
+def sauvegarder_arbre(arbre, chemin_fichier):
+    """Écrit la forme binaire compacte d'un arbre dans un fichier."""
+    with open(chemin_fichier, "wb") as f:
+        for morceau in _morceaux_binaires(arbre):
+            f.write(morceau)
+
+def deserialiser_arbre(tampon):
+    """
+    Construit un ArbreTableau dont les colonnes sont des vues sur 'tampon'
+    (bytes, bytearray ou mmap). Aucun objet Noeud n'est créé.
+    """
+    vue = memoryview(tampon)
+    magie, version, arite, n, m = ENTETE.unpack_from(vue, 0)
+    if magie != MAGIE or version != VERSION_FORMAT:
+        raise ValueError("Format de fichier d'arbre inconnu")
+    pos = ENTETE.size
+    fils = _vue_entiers(vue, pos, n * arite, "i")
+    pos += 4 * n * arite
+    ids = _vue_entiers(vue, pos, n, "i")
+    pos += 4 * n
+    pos += -pos % 8
+    decalages = _vue_entiers(vue, pos, m + 1, "q")
+    pos += 8 * (m + 1)
+    if np is not None: fils = fils.reshape(-1, arite)
+    tab = ArbreTableau(ids, fils, TableChaines(vue[pos:], decalages), arite)
+    tab.source = tampon # Garde le tampon (ou le mmap) en vie avec les vues
+    return tab
+
+def charger_arbre(chemin_fichier, projection=True):
+    """
+    Charge un arbre sauvegardé par sauvegarder_arbre sous forme d'ArbreTableau.
+    Avec projection=True, le fichier est projeté en mémoire (mmap) : hauteur,
+    nb_noeuds et les requêtes de sous-arbre lisent directement le fichier, et
+    les Noeud ne sont créés qu'à la demande (sous_arbre, vers_noeuds).
+    """
+    with open(chemin_fichier, "rb") as f:
+        if projection:
+            tampon = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            tampon = f.read()
+    return deserialiser_arbre(tampon)
+
+# ==========================================
+# 6. ANALYSE PARALLELE (FORETS ET GRANDS ARBRES)
+# ==========================================
+# Les arbres (ou sous-arbres) sont envoyés aux processus sous leur forme
+# binaire compacte (serialiser_arbre) plutôt que sous forme de Noeud picklés.
+# Les noeuds résultats (recherche, plus grand sous-arbre complet) reviennent
+# sous forme de suites de rangs depuis la racine envoyée.
+
+OPERATIONS_ANALYSE = ("hauteur", "nb_noeuds", "est_complet", "sous_arbre_complet_max", "rechercher")
+
+def rangs_depuis(racine, noeud):
+    """Suite des rangs menant de 'racine' à 'noeud' (liens pere requis)."""
+    rangs = []
+    while noeud is not racine:
+        rangs.append(noeud.rang)
+        noeud = noeud.pere
+    rangs.reverse()
+    return rangs
+
+def suivre_rangs(racine, rangs):
+    """Noeud atteint depuis 'racine' en suivant la suite de rangs."""
+    for k in rangs: racine = racine.fils[k]
+    return racine
+
+def _analyser_racine(racine, operations, valeur):
+    """Analyse locale d'un arbre ; les noeuds sont rendus sous forme de rangs."""
+    res = {}
+    if racine is None:
+        res["resume"], res["best"] = RESUME_VIDE, (0, None)
+    else:
+        resume, best_n, best_node = agregats(racine)
+        res["resume"] = resume
+        res["best"] = (best_n, rangs_depuis(racine, best_node) if best_node else None)
+    if "rechercher" in operations:
+        trouve = rechercher(racine, valeur)
+        res["rechercher"] = rangs_depuis(racine, trouve) if trouve else None
+    return res
+
+def _analyser_serialise(donnees, operations, valeur):
+    """
+    Tâche exécutée dans un processus : analyse directement les colonnes de
+    l'arbre désérialisé (vues sans copie), sans reconstruire de Noeud.
+    """
+    tab = deserialiser_arbre(donnees)
+    resume, best_n, best = tab.resumes()
+    res = {"resume": resume, "best": (best_n, tab.rangs(best) if best >= 0 else None)}
+    if "rechercher" in operations:
+        i = tab.rechercher(valeur)
+        res["rechercher"] = tab.rangs(i) if i >= 0 else None
+    return res
+
+def _resultat_final(resume, best, trouve, operations):
+    """Met en forme les résultats demandés (mêmes valeurs que les fonctions séries)."""
+    valeurs = {"hauteur": resume[0], "nb_noeuds": resume[3], "est_complet": resume[2],
+               "sous_arbre_complet_max": best, "rechercher": trouve}
+    return {op: valeurs[op] for op in operations}
+
+def analyser_foret(arbres, operations=OPERATIONS_ANALYSE, valeur=None, processus=None):
+    """
+    Analyse une forêt d'arbres indépendants, une tâche par arbre, sur un pool
+    de 'processus' processus (None : nombre de coeurs). Retourne une liste de
+    dictionnaires {operation: résultat}, dans l'ordre des arbres.
+    """
+    arbres = list(arbres)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processus) as pool:
+        taches = [pool.submit(_analyser_serialise, serialiser_arbre(a), operations, valeur)
+                  if a is not None else None for a in arbres]
+        resultats = []
+        for a, tache in zip(arbres, taches):
+            r = tache.result() if tache is not None else _analyser_racine(None, operations, valeur)
+            best_n, rangs = r["best"]
+            best = (best_n, suivre_rangs(a, rangs) if rangs is not None else None)
+            trouve = r.get("rechercher")
+            trouve = suivre_rangs(a, trouve) if trouve is not None else None
+            resultats.append(_resultat_final(r["resume"], best, trouve, operations))
+    return resultats
+
+def analyser_parallele(racine, profondeur_coupe=1, operations=OPERATIONS_ANALYSE,
+                       valeur=None, processus=None):
+    """
+    Analyse un grand arbre en répartissant ses sous-arbres de profondeur
+    'profondeur_coupe' sur un pool de processus, puis fusionne :
+    - la partie haute (profondeur < coupe) est combinée localement, de bas en
+      haut, à partir des résumés (hauteur, parfait, complet, taille) des tâches ;
+    - la recherche suit l'ordre préfixe : premier résultat dans la partie haute
+      ou dans la première tâche (dans l'ordre) qui a trouvé la valeur.
+    Retourne un dictionnaire {operation: résultat}, identique au calcul série.
+    """
+    if racine is None: return _resultat_final(RESUME_VIDE, (0, None), None, operations)
+    coupes = [n for n, prof, _, _ in iter_bfs(racine, details=True) if prof == profondeur_coupe]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processus) as pool:
+        taches = {id(n): pool.submit(_analyser_serialise, serialiser_arbre(n), operations, valeur)
+                  for n in coupes}
+        partiels = {cle: t.result() for cle, t in taches.items()}
+    par_id = {id(n): n for n in coupes}
+
+    # Fusion ascendante sur la partie haute (post-ordre limité à la coupe)
+    valeurs = {}
+    def sortir(n, pere, rang, prof):
+        if prof == profondeur_coupe:
+            r = partiels[id(n)]
+            best_n, rangs = r["best"]
+            valeurs[id(n)] = (r["resume"], best_n, suivre_rangs(n, rangs) if rangs is not None else None)
+            return
+        best_n, best_node = 0, None
+        for _, f in fils_naires(n):
+            _, bn, bnode = valeurs[id(f)]
+            if bn > best_n: best_n, best_node = bn, bnode
+        res = combiner_resumes(resumes_cases(n, lambda f: valeurs.pop(id(f))[0]))
+        if res[2]: best_n, best_node = res[3], n
+        valeurs[id(n)] = (res, best_n, best_node)
+    parcours_profondeur(racine, lambda n, pere, rang, prof: ELAGUER if prof > profondeur_coupe else None,
+                        sortir)
+    resume, best_n, best_node = valeurs[id(racine)]
+
+    # Recherche : premier noeud en ordre préfixe
+    trouve = [None]
+    def visiter(n, pere, rang, prof):
+        if prof == profondeur_coupe:
+            rangs = partiels[id(n)].get("rechercher")
+            if rangs is None: return ELAGUER
+            trouve[0] = suivre_rangs(par_id[id(n)], rangs)
+            return ARRET
+        if n.info == valeur:
+            trouve[0] = n
+            return ARRET
+    if "rechercher" in operations: parcours_profondeur(racine, visiter)
+    return _resultat_final(resume, (best_n, best_node), trouve[0], operations)
+
+def bench_parallele(n, coeurs=(1, 2, 4), profondeur_coupe=2, valeur="INEXISTANT"):
+    """
+    Compare le calcul série (hauteur, nb_noeuds, est_complet,
+    sous_arbre_complet_max, rechercher) à analyser_parallele pour différents
+    nombres de processus. Retourne [(coeurs, temps, accélération)].
+    """
+    arbre = const_arbre_aleatoire(n)
+    debut = time.perf_counter()
+    attendu = {"hauteur": hauteur(arbre), "nb_noeuds": nb_noeuds(arbre), "est_complet": est_complet(arbre),
+               "sous_arbre_complet_max": sous_arbre_complet_max(arbre),
+               "rechercher": rechercher(arbre, valeur)}
+    t_serie = time.perf_counter() - debut
+    print(f"n={n} série : {t_serie:.4f}s")
+    mesures = []
+    for c in coeurs:
+        debut = time.perf_counter()
+        res = analyser_parallele(arbre, profondeur_coupe, valeur=valeur, processus=c)
+        t = time.perf_counter() - debut
+        if res != attendu: raise AssertionError("Résultat parallèle différent du calcul série")
+        mesures.append((c, t, t_serie / t))
+        print(f"n={n} {c:>2} processus : {t:.4f}s (accélération x{t_serie / t:.2f})")
+    return mesures
+
+# --- Accès concurrent : lecteurs multiples, écrivain unique ---
+# Publication de type RCU : la racine publiée est une version persistante, que
+# personne ne modifie jamais. Un lecteur lit la référence courante (affectation
+# atomique) et travaille sur cette version sans aucun verrou ; un écrivain
+# construit la version suivante par copie de chemin sous un verrou d'écriture,
+# puis la publie d'un seul coup. Un lecteur voit donc l'état d'avant ou d'après
+# une écriture, jamais un état intermédiaire.
+
+class ArbreConcurrent:
+    """
+    Arbre partagé entre threads (voir ci-dessus).
+    - lire() : racine de la version publiée, à utiliser en lecture seule.
+    - generation : nombre d'écritures publiées.
+    Les écritures désignent leur cible par valeur (premier noeud en ordre préfixe).
+    """
+    def __init__(self, racine=None):
+        self._racine = racine
+        self._verrou = threading.Lock()
+        self.generation = 0
+
+    def lire(self):
+        return self._racine
+
+    # --- Lectures (sans verrou) ---
+    def executer(self, fonction, *args):
+        """Applique une fonction de lecture à la version publiée : fonction(racine, *args)."""
+        return fonction(self._racine, *args)
+
+    def hauteur(self):
+        return hauteur(self._racine)
+
+    def rechercher(self, val):
+        return rechercher(self._racine, val)
+
+    def chemin(self, val_a, val_b):
+        """
+        Infos du chemin du premier noeud 'val_a' vers un noeud 'val_b' de son
+        sous-arbre, ou None. Les deux recherches portent sur la même version.
+        """
+        racine = self._racine
+        rangs_a = chemin_rangs(racine, val_a) if racine is not None else None
+        if rangs_a is None: return None
+        a = suivre_rangs(racine, rangs_a)
+        rangs_b = chemin_rangs(a, val_b)
+        if rangs_b is None: return None
+        infos = [a.info]
+        for k in rangs_b:
+            a = a.fils[k]
+            infos.append(a.info)
+        return infos
+
+    # --- Écritures (verrou d'écriture, publication atomique) ---
+    def appliquer(self, fonction, *args):
+        """
+        Publie fonction(racine, *args), qui doit retourner une nouvelle version
+        persistante sans modifier l'ancienne. Retourne la racine publiée.
+        """
+        with self._verrou:
+            racine = fonction(self._racine, *args)
+            if racine is not self._racine:
+                self._racine = racine
+                self.generation += 1
+            return racine
+
+    def _appliquer_sur(self, val, operation, *args):
+        """Résout la cible et applique l'opération persistante sous le même verrou."""
+        with self._verrou:
+            racine = self._racine
+            rangs = chemin_rangs(racine, val) if racine is not None else None
+            if rangs is None: return False
+            nouvelle = operation(racine, rangs, *args)
+            if nouvelle is racine: return False
+            self._racine = nouvelle
+            self.generation += 1
+            return True
+
+    def inserer(self, val_pere, info):
+        return self._appliquer_sur(val_pere, inserer_persistant, info)
+
+    def modifier(self, val, info):
+        return self._appliquer_sur(val, modifier_persistant, info)
+
+    def supprimer(self, val):
+        return self._appliquer_sur(val, supprimer_persistant)
+
+    def extraire(self, val):
+        """Retire et retourne le sous-arbre du premier noeud portant 'val' (None si absent)."""
+        extrait = []
+        def operation(racine, rangs):
+            nouvelle, sous_arbre = extraire_persistant(racine, rangs)
+            extrait.append(sous_arbre)
+            return nouvelle
+        self._appliquer_sur(val, operation)
+        return extrait[0] if extrait else None
+
+class ArbreAsync:
+    """
+    Façade asyncio d'un ArbreConcurrent : chaque opération s'exécute dans un
+    thread (asyncio.to_thread) pour ne pas bloquer la boucle d'événements ;
+    les lectures concurrentes ne s'attendent jamais entre elles.
+    """
+    def __init__(self, arbre=None):
+        self.arbre = arbre if isinstance(arbre, ArbreConcurrent) else ArbreConcurrent(arbre)
+
+    async def executer(self, fonction, *args):
+        return await asyncio.to_thread(self.arbre.executer, fonction, *args)
+
+    async def hauteur(self):
+        return await asyncio.to_thread(self.arbre.hauteur)
+
+    async def rechercher(self, val):
+        return await asyncio.to_thread(self.arbre.rechercher, val)
+
+    async def chemin(self, val_a, val_b):
+        return await asyncio.to_thread(self.arbre.chemin, val_a, val_b)
+
+    async def inserer(self, val_pere, info):
+        return await asyncio.to_thread(self.arbre.inserer, val_pere, info)
+
+    async def modifier(self, val, info):
+        return await asyncio.to_thread(self.arbre.modifier, val, info)
+
+    async def supprimer(self, val):
+        return await asyncio.to_thread(self.arbre.supprimer, val)
+
+    async def extraire(self, val):
+        return await asyncio.to_thread(self.arbre.extraire, val)
+
+def bench_concurrence(n, lecteurs=4, duree=1.0, pause_ecriture=0.0):
+    """
+    Stress test : 'lecteurs' threads enchaînent des lectures (nb_noeuds,
+    rechercher, chemin sur une même version) pendant 'duree' secondes, sans puis
+    avec un écrivain qui insère et supprime un noeud en boucle. Chaque lecteur
+    vérifie qu'il ne voit que des états publiés (n ou n + 1 noeuds).
+    Retourne {avec_ecrivain: (lectures/s, écritures/s)}.
+    """
+    arbre = ArbreConcurrent(const_arbre_aleatoire(n))
+    cible = f"N{n - 1}"
+    resultats = {}
+    for avec_ecrivain in (False, True):
+        fin = threading.Event()
+        lectures, ecritures, erreurs = [0] * lecteurs, [0], []
+        def lire(i):
+            while not fin.is_set():
+                racine = arbre.lire()
+                taille = nb_noeuds(racine)
+                if taille not in (n, n + 1): erreurs.append(taille)
+                rechercher(racine, cible)
+                arbre.chemin("Root", cible)
+                lectures[i] += 1
+        def ecrire():
+            while not fin.is_set():
+                arbre.inserer(cible, "TMP")
+                arbre.supprimer("TMP")
+                ecritures[0] += 2
+                if pause_ecriture: time.sleep(pause_ecriture)
+        threads = [threading.Thread(target=lire, args=(i,)) for i in range(lecteurs)]
+        if avec_ecrivain: threads.append(threading.Thread(target=ecrire))
+        for t in threads: t.start()
+        time.sleep(duree)
+        fin.set()
+        for t in threads: t.join()
+        if erreurs: raise AssertionError(f"État intermédiaire observé : tailles {sorted(set(erreurs))}")
+        resultats[avec_ecrivain] = (sum(lectures) / duree, ecritures[0] / duree)
+        print(f"n={n} {lecteurs} lecteurs, {'avec' if avec_ecrivain else 'sans'} écrivain : "
+              f"{sum(lectures) / duree:.1f} lectures/s, {ecritures[0] / duree:.1f} écritures/s")
+    return resultats
+
+# ==========================================
+# 7. EVALUATION EXPERIMENTALE
+# ==========================================
+
+class _Puits(io.TextIOBase):
+    """Flux texte qui ignore tout ce qu'on y écrit (aucune mémoire consommée)."""
+    def writable(self):
+        return True
+
+    def write(self, s):
+        return len(s)
+
+def mesurer_temps(fonction, *args):
+    """
+    Mesure le temps d'exécution d'une fonction.
+    Utilise contextlib pour supprimer les print() durant la mesure afin de ne mesurer
+    que le temps de calcul pur, pas le temps d'affichage console. Le ramasse-miettes
+    est vidé avant la mesure puis suspendu pendant celle-ci : une collecte déclenchée
+    par les allocations d'une autre mesure ne vient pas fausser celle-ci.
+    """
+    gc.collect()
+    actif = gc.isenabled()
+    gc.disable()
+    try:
+        # Redirection de la sortie standard vers un puits (rien n'est conservé)
+        with contextlib.redirect_stdout(_Puits()):
+            start = time.perf_counter()
+            fonction(*args)
+            end = time.perf_counter()
+    finally:
+        if actif: gc.enable()
+    return end - start
+
+def mesurer_compteurs(fonction, *args, memoire=True):
+    """
+    Exécute une fonction sous instrumentation (sortie ignorée, comme mesurer_temps)
+    et retourne ses Compteurs. À lancer séparément des mesures de temps.
+    """
+    with contextlib.redirect_stdout(_Puits()), instrumenter(memoire) as c:
+        fonction(*args)
+    return c
+
+# --- Formes d'arbres disponibles pour les mesures ---
+# "large" : forte arité (fils creux), remplie en largeur comme "aleatoire".
+# "motifs" : infos répétées par niveau, nombreux sous-arbres identiques (canoniser).
+# "eventail", "biaise", "galton" : formes aléatoires de generer_arbre (graine 0).
+ARITE_LARGE = 256
+
+FORMES = {
+    "aleatoire": const_arbre_aleatoire,
+    "chaine": const_arbre_chaine,
+    "large": lambda nb_noeuds: const_arbre_aleatoire(nb_noeuds, ARITE_LARGE),
+    "motifs": const_arbre_motifs,
+    "eventail": lambda nb_noeuds: generer_arbre(nb_noeuds, "eventail"),
+    "biaise": lambda nb_noeuds: generer_arbre(nb_noeuds, "biaise"),
+    "galton": lambda nb_noeuds: generer_arbre(nb_noeuds, "galton_watson"),
+}
+
+# --- Opérations mesurées ---
+# Chaque préparation reçoit (forme, n, arbre) et retourne (fonction, arguments) ;
+# elle n'est pas chronométrée. Toutes les opérations partagent un arbre par
+# taille : une opération destructive déclare les infos des noeuds qu'elle
+# modifie, et reçoit à chaque répétition un instantané (copie des seuls chemins
+# racine -> cibles) au lieu d'un arbre reconstruit.
+# Les noeuds sont nommés "N<i>" par les générateurs : N<n-1> est le dernier créé.
+
+def _cible_derniere(n):
+    return [f"N{n - 1}"]
+
+def _cible_milieu(n):
+    return [f"N{n // 2}"]
+
+def _cibles_lot(n):
+    return [f"N{i}" for i in range(n // 2, n, max(1, n // 200))]
+
+def _prep_const(forme, n, arbre):
+    return FORMES[forme], (n,)
+
+def _prep_generer_tableau(forme, n, arbre):
+    return generer_arbre, (n, "complet", N, 0, "tableau")
+
+def _prep_lecture(fonction, *extra):
+    return lambda forme, n, arbre: (fonction, (arbre,) + extra)
+
+def _prep_rech_index(forme, n, arbre):
+    return rechercher, (arbre, "INEXISTANT", IndexInfo(arbre))
+
+def _prep_chemin(forme, n, arbre):
+    return chemin, (arbre, rechercher(arbre, f"N{n - 1}") or arbre)
+
+def _prep_resoudre_chemin(forme, n, arbre):
+    # Tables de noms construites le long du chemin (non chronométré)
+    chemin_cible = chemin_complet(rechercher(arbre, f"N{n - 1}") or arbre)
+    resoudre_chemin(arbre, chemin_cible)
+    return resoudre_chemin, (arbre, chemin_cible)
+
+def _prep_sous_arbre(forme, n, arbre):
+    return afficher_sous_arbre, (arbre, rechercher(arbre, "N1") or arbre)
+
+def _prep_inserer(forme, n, arbre):
+    return inserer, (rechercher(arbre, f"N{n - 1}") or arbre, "TEST")
+
+def _prep_modifier(forme, n, arbre):
+    return modifier, (rechercher(arbre, f"N{n - 1}") or arbre, "MOD")
+
+def _prep_supprimer(forme, n, arbre):
+    return supprimer, (arbre, f"N{n // 2}")
+
+def _prep_extraire(forme, n, arbre):
+    return extraire, (arbre, f"N{n // 2}")
+
+def _infos_cache(arbre):
+    return hauteur_cache(arbre), est_complet_cache(arbre), sous_arbre_complet_max_cache(arbre)
+
+def _prep_infos_cache(forme, n, arbre):
+    # Agrégats calculés puis une insertion : seule la mise à jour est mesurée
+    agregats(arbre)
+    inserer(rechercher(arbre, f"N{n - 1}") or arbre, "TEST")
+    return _infos_cache, (arbre,)
+
+def _paires_aleatoires(arbre, nb=1000, graine=0):
+    noeuds = list(iter_bfs(arbre))
+    rnd = random.Random(graine)
+    return [(rnd.choice(noeuds), rnd.choice(noeuds)) for _ in range(nb)]
+
+def _prep_lca_lot(forme, n, arbre):
+    return IndexLCA(arbre).lca_lot, (_paires_aleatoires(arbre),)
+
+def _ancetres_lot(etiquettes, paires):
+    return sum(etiquettes.est_ancetre(a, b) for a, b in paires)
+
+def _prep_ancetres(forme, n, arbre):
+    return _ancetres_lot, (EtiquetageIntervalle(arbre), _paires_aleatoires(arbre))
+
+def _prep_sous_arbre_etiquete(forme, n, arbre):
+    return afficher_sous_arbre, (arbre, rechercher(arbre, "N1") or arbre, EtiquetageIntervalle(arbre))
+
+def _prep_aretes(forme, n, arbre):
+    aretes = [(pere.info, f.info) for f, _, pere, _ in iter_bfs(arbre, details=True) if pere is not None]
+    # Même arité que l'arbre de départ : (aretes, racine, index, arite)
+    return construire_depuis_aretes, (aretes, None, None, len(arbre.fils))
+
+def _prep_supprimer_lot(forme, n, arbre):
+    return supprimer_lot, (arbre, _cibles_lot(n))
+
+def _prep_empreintes(forme, n, arbre):
+    # Empreintes effacées (non chronométré) : le calcul complet est mesuré
+    for noeud in iter_bfs(arbre): noeud.empreinte = None
+    return empreintes, (arbre,)
+
+def _parcourir_vue(racine):
+    # Parcours complet de la vue binaire paresseuse (aucune copie de l'arbre)
+    return sum(1 for _ in iter_dfs_pre(vue_binaire(racine), enfants=fils_binaires))
+
+def _prep_inverse(forme, n, arbre):
+    return binaire_vers_naire, (transfo_binaire(arbre), len(arbre.fils))
+
+def _prep_instantane(forme, n, arbre):
+    return instantane, (arbre, [rechercher(arbre, f"N{n // 2}") or arbre])
+
+def _prep_inserer_persistant(forme, n, arbre):
+    return inserer_persistant, (arbre, chemin_rangs(arbre, f"N{n - 1}") or [], "TEST")
+
+def _prep_supprimer_persistant(forme, n, arbre):
+    return supprimer_persistant, (arbre, chemin_rangs(arbre, f"N{n // 2}") or [])
+
+def _cibles_diff(n):
+    return [f"N{i}" for i in range(n // 2, n, max(1, n // 9))]
+
+def _version_cibles_diff(arbre, n):
+    # Changement de taille fixe quel que soit n ; empreintes calculées hors mesure
+    empreintes(arbre)
+    noms = set(_cibles_diff(n))
+    return _version_modifiee(arbre, [c for c in iter_dfs_pre(arbre) if c.info in noms])
+
+def _prep_diff(forme, n, arbre):
+    return diff_arbres, (arbre, _version_cibles_diff(arbre, n))
+
+def _prep_patch(forme, n, arbre):
+    return appliquer_diff, (arbre, diff_arbres(arbre, _version_cibles_diff(arbre, n)))
+
+def _prep_memo(fonction):
+    # Analyse mémoïsée d'un arbre canonique, cache LRU vide à chaque mesure
+    return lambda forme, n, arbre: (fonction, (canoniser(arbre), CacheAnalyse()))
+
+# Formes dont les noeuds ne portent pas de noms uniques "N<i>" : les opérations
+# qui visent un noeud par son nom n'y trouveraient rien (mesure d'un no-op), et
+# Aretes confondrait les infos répétées en un seul noeud.
+SANS_NOMS = ("motifs",)
+
+# nom -> (préparation, cibles modifiées (None si lecture seule), formes exclues)
+OPERATIONS = {
+    "Const": (_prep_const, None, ()),
+    "GenTab": (_prep_generer_tableau, None, ()),
+    "Affich": (_prep_lecture(afficher_parcours), None, ()),
+    "Haut": (_prep_lecture(hauteur), None, ()),
+    "NbN": (_prep_lecture(nb_noeuds), None, ()),
+    "Rech": (_prep_lecture(rechercher, "INEXISTANT"), None, ()),
+    "RechI": (_prep_rech_index, None, ()),
+    "Chem": (_prep_chemin, None, SANS_NOMS),
+    "ChemR": (_prep_resoudre_chemin, None, SANS_NOMS),
+    "Inser": (_prep_inserer, _cible_derniere, SANS_NOMS),
+    "Modif": (_prep_modifier, _cible_derniere, SANS_NOMS),
+    "Suppr": (_prep_supprimer, _cible_milieu, SANS_NOMS),
+    # Le rendu d'une chaîne produit O(n^2) caractères : hors sujet ici
+    "SsArb": (_prep_sous_arbre, None, ("chaine",) + SANS_NOMS),
+    "Compl": (_prep_lecture(est_complet), None, ()),
+    "MaxSA": (_prep_lecture(sous_arbre_complet_max), None, ()),
+    "Extr": (_prep_extraire, _cible_milieu, SANS_NOMS),
+    "Trans": (_prep_lecture(transfo_binaire), None, ()),
+    "InfosC": (_prep_infos_cache, _cible_derniere, SANS_NOMS),
+    "IdxLCA": (_prep_lecture(IndexLCA), None, ()),
+    "LCAx1k": (_prep_lca_lot, None, ()),
+    "Etiq": (_prep_lecture(EtiquetageIntervalle), None, ()),
+    "Anc1k": (_prep_ancetres, None, ()),
+    "SsArbE": (_prep_sous_arbre_etiquete, None, ("chaine",) + SANS_NOMS),
+    "Aretes": (_prep_aretes, None, SANS_NOMS),
+    "SupLot": (_prep_supprimer_lot, _cibles_lot, SANS_NOMS),
+    "Empr": (_prep_empreintes, None, ()),
+    "Canon": (_prep_lecture(canoniser), None, ()),
+    "HautM": (_prep_memo(hauteur_memo), None, ()),
+    "TransM": (_prep_memo(transfo_binaire_memo), None, ()),
+    "Dupl": (_prep_lecture(sous_arbres_dupliques), None, ()),
+    "Snap": (_prep_instantane, None, SANS_NOMS),
+    "Vue": (_prep_lecture(_parcourir_vue), None, ()),
+    "Mater": (lambda forme, n, arbre: (materialiser_binaire, (vue_binaire(arbre),)), None, ()),
+    "Inv": (_prep_inverse, None, ()),
+    "PInser": (_prep_inserer_persistant, None, SANS_NOMS),
+    "PSuppr": (_prep_supprimer_persistant, None, SANS_NOMS),
+    "Diff": (_prep_diff, None, SANS_NOMS),
+    "Patch": (_prep_patch, _cibles_diff, SANS_NOMS),
+}
+
+def _statistiques(temps):
+    """Médiane, écart interquartile et minimum d'une série de mesures."""
+    temps = sorted(temps)
+    if len(temps) >= 2:
+        q1, q2, q3 = statistics.quantiles(temps, n=4, method="inclusive")
+    else:
+        q1 = q2 = q3 = temps[0]
+    return {"mediane": q2, "iqr": q3 - q1, "min": temps[0]}
+
+def executer_benchmark(tailles, formes=("aleatoire",), operations=None,
+                       repetitions=5, echauffement=1, rapport=None, instrumentation=False, memoire=True):
+    """
+    Mesure chaque opération pour chaque forme et chaque taille.
+    - echauffement : exécutions préalables non comptées.
+    - repetitions  : exécutions mesurées (médiane et écart interquartile).
+    - rapport      : fonction optionnelle appelée avec chaque résultat (progression).
+    - instrumentation : ajoute les champs de Compteurs, relevés lors d'une
+      exécution supplémentaire non chronométrée ('memoire' : avec tracemalloc).
+    Retourne la liste des résultats (dictionnaires forme/n/operation/statistiques).
+    """
+    if repetitions < 1: raise ValueError("Il faut au moins une répétition mesurée")
+    if echauffement < 0: raise ValueError("Le nombre d'exécutions d'échauffement doit être positif")
+    operations = list(operations or OPERATIONS)
+    resultats = []
+    for forme in formes:
+        construire = FORMES[forme]
+        for n in tailles:
+            partage = construire(n) # Arbre partagé, jamais modifié
+            index = None # IndexInfo de 'partage', construit au premier besoin
+            for nom in operations:
+                preparer, cibles, exclues = OPERATIONS[nom]
+                if forme in exclues: continue
+                if cibles is not None:
+                    if index is None: index = IndexInfo(partage)
+                    noeuds = [c for c in map(index.premier, cibles(n)) if c is not None]
+                temps = []
+                for essai in range(echauffement + repetitions):
+                    arbre = partage if cibles is None else instantane(partage, noeuds)
+                    fonction, args = preparer(forme, n, arbre)
+                    t = mesurer_temps(fonction, *args)
+                    if essai >= echauffement: temps.append(t)
+                res = {"forme": forme, "n": n, "operation": nom, "repetitions": repetitions}
+                res.update(_statistiques(temps))
+                if instrumentation:
+                    arbre = partage if cibles is None else instantane(partage, noeuds)
+                    fonction, args = preparer(forme, n, arbre)
+                    compteurs = mesurer_compteurs(fonction, *args, memoire=memoire).en_dict()
+                    if not memoire: del compteurs["pic_memoire"]
+                    res.update(compteurs)
+                resultats.append(res)
+                if rapport: rapport(res)
+            del partage, index
+    return resultats
+
+def exposants_complexite(resultats):
+    """
+    Ajuste t = c * n^k (moindres carrés en log-log) pour chaque (forme, opération).
+    Retourne {(forme, operation): k} ; k ~ 1 pour une opération linéaire.
+    """
+    series = {}
+    for r in resultats:
+        if r["mediane"] > 0 and r["n"] > 0:
+            series.setdefault((r["forme"], r["operation"]), []).append(
+                (math.log(r["n"]), math.log(r["mediane"])))
+    exposants = {}
+    for cle, points in series.items():
+        if len({x for x, _ in points}) < 2: continue
+        mx = sum(x for x, _ in points) / len(points)
+        my = sum(y for _, y in points) / len(points)
+        num = sum((x - mx) * (y - my) for x, y in points)
+        den = sum((x - mx) ** 2 for x, _ in points)
+        exposants[cle] = num / den
+    return exposants
+
+def comparer_reference(resultats, reference, seuil=1.5, plancher=1e-4):
+    """
+    Compare les médianes à celles d'une exécution de référence (même format JSON).
+    Une régression est signalée si la médiane dépasse 'seuil' fois la référence
+    et que l'écart absolu dépasse 'plancher' secondes (on ignore le bruit).
+    Retourne la liste des régressions (dictionnaires).
+    """
+    base = {(r["forme"], r["n"], r["operation"]): r["mediane"] for r in reference["resultats"]}
+    regressions = []
+    for r in resultats:
+        ref = base.get((r["forme"], r["n"], r["operation"]))
+        if ref is None: continue
+        if r["mediane"] > seuil * ref and r["mediane"] - ref > plancher:
+            regressions.append({"forme": r["forme"], "n": r["n"], "operation": r["operation"],
+                                "reference": ref, "mediane": r["mediane"],
+                                "ratio": r["mediane"] / ref if ref else float("inf")})
+    return regressions
+
+def afficher_tableau(resultats, exposants=None, largeur=9):
+    """Affiche les médianes (secondes) sous forme de tableau : une ligne par forme/taille."""
+    operations = list(dict.fromkeys(r["operation"] for r in resultats))
+    lignes = {}
+    for r in resultats:
+        lignes.setdefault((r["forme"], r["n"]), {})[r["operation"]] = r["mediane"]
+    entete = f"{'Forme':<10} | {'N':<9} | " + " | ".join(f"{o:<{largeur}}" for o in operations)
+    print("=" * len(entete))
+    print(entete)
+    print("-" * len(entete))
+    for (forme, n), valeurs in lignes.items():
+        cellules = [f"{valeurs[o]:<{largeur}.6f}" if o in valeurs else " " * largeur for o in operations]
+        print(f"{forme:<10} | {n:<9} | " + " | ".join(cellules))
+    if exposants:
+        print("-" * len(entete))
+        for forme in dict.fromkeys(f for f, _ in lignes):
+            cellules = [f"{exposants[(forme, o)]:<{largeur}.2f}" if (forme, o) in exposants else " " * largeur
+                        for o in operations]
+            print(f"{forme:<10} | {'exposant':<9} | " + " | ".join(cellules))
+    print("=" * len(entete))
+
+def afficher_compteurs(resultats):
+    """
+    Affiche, une ligne par forme/taille/opération, la médiane (secondes) suivie
+    des compteurs d'instrumentation en colonnes supplémentaires.
+    """
+    champs = [c for c in Compteurs.CHAMPS if resultats and c in resultats[0]]
+    if not champs: return
+    entete = (f"{'Forme':<10} | {'N':<9} | {'Operation':<9} | {'mediane':>10} | "
+              + " | ".join(f"{c:>14}" for c in champs))
+    print("=" * len(entete))
+    print(entete)
+    print("-" * len(entete))
+    for r in resultats:
+        print(f"{r['forme']:<10} | {r['n']:<9} | {r['operation']:<9} | {r['mediane']:>10.6f} | "
+              + " | ".join(f"{r[c]:>14}" for c in champs))
+    print("=" * len(entete))
+
+def ecrire_json(chemin_fichier, resultats, exposants, parametres):
+    donnees = {
+        "parametres": parametres,
+        "resultats": resultats,
+        "exposants": [{"forme": f, "operation": o, "exposant": k} for (f, o), k in exposants.items()],
+    }
+    with open(chemin_fichier, "w", encoding="utf-8") as f:
+        json.dump(donnees, f, indent=2)
+
+def ecrire_csv(chemin_fichier, resultats):
+    with open(chemin_fichier, "w", newline="", encoding="utf-8") as f:
+        ecrivain = csv.DictWriter(f, fieldnames=list(resultats[0]) if resultats else ["forme"])
+        ecrivain.writeheader()
+        ecrivain.writerows(resultats)
+
+def lancer_evaluation():
+    """
+    Lance la batterie de tests sur des tailles croissantes (10 à 1000), puis sur
+    des chaînes très profondes (jusqu'à 10^6 noeuds).
+    Affiche un tableau comparatif des temps d'exécution (médianes), puis les
+    compteurs d'instrumentation de chaque mesure (sans le pic mémoire pour les
+    chaînes : tracemalloc multiplierait la durée de cette seconde série).
+    """
+    res = executer_benchmark([10, 20, 30, 40, 50, 100, 200, 500, 1000], ("aleatoire",),
+                             repetitions=3, echauffement=1, instrumentation=True)
+    afficher_tableau(res, exposants_complexite(res))
+    afficher_compteurs(res)
+    res = executer_benchmark([1000, 10000, 100000, 1000000], ("chaine",),
+                             operations=["Const", "Haut", "NbN", "Rech", "Chem", "Compl", "MaxSA", "Trans",
+                                         "Vue", "Inv"],
+                             repetitions=1, echauffement=0, instrumentation=True, memoire=False)
+    afficher_tableau(res, exposants_complexite(res))
+    afficher_compteurs(res)
+
+def _entier_minimum(minimum):
+    """Type argparse : entier supérieur ou égal à 'minimum'."""
+    def convertir(texte):
+        valeur = int(texte)
+        if valeur < minimum: raise argparse.ArgumentTypeError(f"doit valoir au moins {minimum}")
+        return valeur
+    return convertir
+
+def main_benchmark(argv):
+    """
+    Mode benchmark non interactif (pour l'intégration continue).
+    Code de retour : 0, ou 1 si des régressions par rapport à la référence sont détectées.
+    """
+    parser = argparse.ArgumentParser(prog="tree_complexity.py bench",
+                                     description="Évaluation expérimentale des opérations sur arbres N-aires.")
+    parser.add_argument("--tailles", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        help="tailles des arbres (jusqu'à 10^7)")
+    parser.add_argument("--formes", nargs="+", default=["aleatoire"], choices=sorted(FORMES))
+    parser.add_argument("--operations", nargs="+", default=None, choices=list(OPERATIONS))
+    parser.add_argument("--repetitions", type=_entier_minimum(1), default=5)
+    parser.add_argument("--echauffement", type=_entier_minimum(0), default=1)
+    parser.add_argument("--compteurs", action="store_true",
+                        help="relève aussi noeuds visités, pic de pile, allocations et pic mémoire")
+    parser.add_argument("--json", help="fichier de sortie JSON")
+    parser.add_argument("--csv", help="fichier de sortie CSV")
+    parser.add_argument("--reference", help="JSON d'une exécution précédente à comparer")
+    parser.add_argument("--seuil", type=float, default=1.5,
+                        help="ratio médiane/référence au-delà duquel une régression est signalée")
+    args = parser.parse_args(argv)
+
+    def progression(r):
+        print(f"  {r['forme']:<10} n={r['n']:<9} {r['operation']:<7} "
+              f"médiane={r['mediane']:.6f}s iqr={r['iqr']:.6f}s", file=sys.stderr)
+
+    resultats = executer_benchmark(args.tailles, args.formes, args.operations,
+                                   args.repetitions, args.echauffement, progression, args.compteurs)
+    exposants = exposants_complexite(resultats)
+    afficher_tableau(resultats, exposants)
+    if args.compteurs: afficher_compteurs(resultats)
+    if args.json: ecrire_json(args.json, resultats, exposants, vars(args))
+    if args.csv: ecrire_csv(args.csv, resultats)
+    if args.reference:
+        with open(args.reference, encoding="utf-8") as f:
+            regressions = comparer_reference(resultats, json.load(f), args.seuil)
+        for r in regressions:
+            print(f"REGRESSION {r['forme']} n={r['n']} {r['operation']} : "
+                  f"{r['mediane']:.6f}s contre {r['reference']:.6f}s (x{r['ratio']:.2f})")
+        if regressions: return 1
+        print("Aucune régression par rapport à la référence.")
+    return 0
+
+# ==========================================
+# 8. MENU PRINCIPAL
+# ==========================================
+
+def pause():
+    input("\n[Entrée pour continuer...]")
 
 def menu():
     """Boucle principale du programme gérant l'interaction utilisateur."""
     racine = None
+    index = None # IndexInfo de l'arbre chargé (recherches en O(1))
+    lca = None   # IndexLCA construit à la demande (chemins entre noeuds)
+    etiq = None  # EtiquetageIntervalle construit à la demande (ancêtres)
     
     while True:
         # Affichage du menu
@@ -462,6 +3849,9 @@ def menu():
         print("11. Transformer en Binaire")
         print("--- Mode 3 : Evaluation ---")
         print("12. Evaluation Expérimentale (10 à 1000 noeuds)")
+        print("--- Mode 4 : Fichiers ---")
+        print("13. Sauvegarder l'arbre (format binaire)")
+        print("14. Charger un arbre (format binaire)")
         print("0.  Quitter")
         
         choix = input(">>> Choix : ")
@@ -469,16 +3859,19 @@ def menu():
         # --- Gestion des choix ---
         if choix == '1': 
             racine = constArbreManuel()
+            index = IndexInfo(racine)
             print("Nouvel arbre créé.")
             afficher_arborescence(racine)
             
         elif choix == '2': 
             racine = constArbre1()
+            index = IndexInfo(racine)
             print("Arbre Test 1 chargé.")
             afficher_arborescence(racine)
 
         elif choix == '3': 
             racine = constArbre2()
+            index = IndexInfo(racine)
             print("Arbre Test 2 chargé.")
             afficher_arborescence(racine)
 
@@ -495,10 +3888,10 @@ def menu():
         elif choix == '5':
             if racine:
                 pere_nom = input("Nom du père : ")
-                pere = rechercher(racine, pere_nom)
+                pere = rechercher(racine, pere_nom, index)
                 if pere:
                     nom = input("Nom du nouveau noeud : ")
-                    if inserer(pere, nom):
+                    if inserer(pere, nom, index):
                         print("\n--> Arbre mis à jour :")
                         afficher_arborescence(racine)
                 else: print("Père introuvable.")
@@ -510,7 +3903,7 @@ def menu():
         elif choix == '6':
             if racine:
                 val = input("Noeud à supprimer : ")
-                racine = supprimer(racine, val)
+                racine = supprimer(racine, val, index)
                 print("\n--> Arbre mis à jour :")
                 if racine: afficher_arborescence(racine)
             else: print("Arbre vide.")
@@ -518,41 +3911,61 @@ def menu():
 
         elif choix == '7':
             val = input("Noeud à modifier : ")
-            cible = rechercher(racine, val)
+            cible = rechercher(racine, val, index)
             if cible:
                 new = input("Nouveau nom : ")
-                modifier(cible, new)
+                modifier(cible, new, index)
                 print("\n--> Arbre mis à jour :")
                 afficher_arborescence(racine)
             else: print("Introuvable.")
             pause()
 
         elif choix == '8':
-            sub = input("1. Chercher info\n2. Chemin entre 2 noeuds\n>>> ")
+            sub = input("1. Chercher info\n2. Chemin entre 2 noeuds\n3. Chercher par chemin (ex. C:/Users/*)\n4. Tester si A est un ancêtre de B\n>>> ")
             if sub == '1':
                 val = input("Valeur : ")
-                res = rechercher(racine, val)
+                res = rechercher(racine, val, index)
                 print(f"Résultat : {'Trouvé' if res else 'Non trouvé'}")
             elif sub == '2':
                 a = input("Départ : ")
                 b = input("Arrivée : ")
-                na = rechercher(racine, a)
-                nb = rechercher(racine, b)
-                if na and nb: chemin(na, nb)
+                na = rechercher(racine, a, index)
+                nb = rechercher(racine, b, index)
+                if na and nb:
+                    # Chemin entre deux noeuds quelconques (via leur ancêtre commun)
+                    if lca is None or lca.racine is not racine: lca = IndexLCA(racine)
+                    print("Chemin trouvé : " + " -> ".join(n.info for n in lca.chemin_entre(na, nb)))
+                else: print("Noeuds introuvables.")
+            elif sub == '3':
+                motif = input("Chemin ou motif : ")
+                trouves = list(rechercher_chemins(racine, motif))
+                for n in trouves: print(chemin_complet(n))
+                if not trouves: print("Aucun noeud.")
+            elif sub == '4':
+                na = rechercher(racine, input("A : "), index)
+                nb = rechercher(racine, input("B : "), index)
+                if na and nb:
+                    # Inclusion d'intervalles, l'étiquetage est refait si l'arbre a changé
+                    if etiq is None or etiq.racine is not racine: etiq = EtiquetageIntervalle(racine)
+                    print(f"A ancêtre de B : {'Oui' if etiq.est_ancetre(na, nb) else 'Non'}"
+                          f" (profondeurs {etiq.profondeur(na)} et {etiq.profondeur(nb)},"
+                          f" {etiq.taille(na)} noeud(s) sous A)")
                 else: print("Noeuds introuvables.")
             pause()
 
         elif choix == '9':
             if racine:
-                print(f"Hauteur : {hauteur(racine)}")
-                print(f"Est Complet ? : {est_complet(racine)}")
-                n, node = sous_arbre_complet_max(racine)
+                # Agrégats en cache : seul le chemin modifié depuis la dernière
+                # consultation est recalculé
+                print(f"Hauteur : {hauteur_cache(racine)}")
+                print(f"Est Complet ? : {est_complet_cache(racine)}")
+                n, node = sous_arbre_complet_max_cache(racine)
                 if node: print(f"Max Sous-Arbre Complet : Racine='{node.info}' (Taille {n})")
             pause()
 
         elif choix == '10':
             val = input("Racine du sous-arbre à extraire : ")
-            racine, ext = extraire(racine, val)
+            racine, ext = extraire(racine, val, index)
             if ext:
                 print("\n--> Reste de l'arbre principal :")
                 if racine: afficher_arborescence(racine)
@@ -570,6 +3983,26 @@ def menu():
 
         elif choix == '12':
             lancer_evaluation()
+            pause()
+
+        elif choix == '13':
+            if racine:
+                nom = input("Fichier : ")
+                sauvegarder_arbre(racine, nom)
+                print("Arbre sauvegardé.")
+            else: print("Arbre vide.")
+            pause()
+
+        elif choix == '14':
+            nom = input("Fichier : ")
+            try:
+                racine = charger_arbre(nom).vers_noeuds()
+                index = IndexInfo(racine)
+                print("Arbre chargé.")
+                if racine: afficher_arborescence(racine)
+            except (OSError, ValueError) as e:
+                print(f"Chargement impossible : {e}")
+            pause()
 
         elif choix == '0':
             break
@@ -577,4 +4010,21 @@ def menu():
             print("Choix invalide.")
 
 if __name__ == "__main__":
+    # 'python tree_complexity.py bench [options]' : évaluation non interactive
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        sys.exit(main_benchmark(sys.argv[2:]))
+    # 'python tree_complexity.py parallele N [coeurs...]' : accélération du pool de processus
+    if len(sys.argv) > 2 and sys.argv[1] == "parallele":
+        bench_parallele(int(sys.argv[2]), [int(c) for c in sys.argv[3:]] or (1, 2, 4))
+        sys.exit(0)
+    # 'python tree_complexity.py diff N [changements...]' : coût selon la taille du changement
+    if len(sys.argv) > 2 and sys.argv[1] == "diff":
+        bench_diff(int(sys.argv[2]), [int(k) for k in sys.argv[3:]] or (1, 10, 100, 1000))
+        sys.exit(0)
+    # 'python tree_complexity.py concurrence N [lecteurs [durée]]' : lectures sous écritures
+    if len(sys.argv) > 2 and sys.argv[1] == "concurrence":
+        args = sys.argv[2:]
+        bench_concurrence(int(args[0]), int(args[1]) if len(args) > 1 else 4,
+                          float(args[2]) if len(args) > 2 else 1.0)
+        sys.exit(0)
     menu()